@@ -0,0 +1,89 @@
+"""
+BOK 보고서 텍스트 정규화 벤치마크.
+
+    python benchmarks/normalize_bench.py [raw.txt ...]
+
+raw.txt 는 bok-cache/{sha}/raw.txt (pdfminer 추출 원문)를 받아 쓰면 된다.
+파일을 주지 않으면 보고서 형태를 흉내 낸 합성 코퍼스(약 150k 자)를 쓴다.
+분리 이전 구현(tests/unit/legacy_normalize.py)과 결과·시간을 비교한다.
+"""
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, os.path.join(ROOT, "bok"))
+sys.path.insert(0, os.path.join(ROOT, "tests", "unit"))
+
+import legacy_normalize as legacy  # noqa: E402
+import normalize  # noqa: E402
+
+REPEAT = 5
+
+SENTENCES = [
+    "국내 경기는 수출을 중심으로 완만한 회복세를 이어갔다.",
+    "소비자물가 상승률은 2.7%로 전월(2.9%)보다 낮아졌다.",
+    "다만 중동 지역 지정학적 리스크 등으로 불확실성이 높은 상황이다1).",
+    "가계부채 증가세는 주택 관련 대출을 중심으로 확대되었다.",
+    "Ⅰ-2. 금융시장 동향 (금융시장국 자금시장팀)",
+    "장기 시장금리는 미 국채금리 하락의 영향으로 내렸다ž 단기금리는 보합.",
+]
+NOISE = [
+    "[그림 Ⅰ-3] 소비자물가 상승률",
+    "주: 1) 전년동기대비 기준",
+    "자료: 통계청, 한국은행",
+    "- 12 -",
+    "2.1 2.3 -0.4 1,234 2024/05 3.3 4.1",
+    "2021 2022 2023 2024 2025",
+]
+
+
+def synthetic_report(pages: int = 180, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    out = []
+    for page in range(1, pages + 1):
+        for _ in range(rng.randint(20, 30)):
+            out.append(rng.choice(SENTENCES) if rng.random() < 0.75 else rng.choice(NOISE))
+        out.append(f"- {page} -\f")
+    out.append("주요 통계 및 참고자료")
+    return "\n".join(out)
+
+
+def pipeline(module, text: str) -> str:
+    text = module.unify_roman_and_symbols(text)
+    text = module.normalize_text(text)
+    text = module.remove_table_of_contents(text)
+    text = module.cut_statistics_section(text)
+    return module.clean_non_text_blocks(text)
+
+
+def best_of(fn) -> float:
+    timings = []
+    for _ in range(REPEAT):
+        t = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - t)
+    return min(timings)
+
+
+def main():
+    paths = sys.argv[1:]
+    if paths:
+        corpus = {p: open(p, encoding="utf-8").read() for p in paths}
+    else:
+        corpus = {"synthetic": synthetic_report()}
+
+    for name, text in corpus.items():
+        assert pipeline(normalize, text) == pipeline(legacy, text), f"{name}: output differs"
+
+        old = best_of(lambda: pipeline(legacy, text))
+        new = best_of(lambda: pipeline(normalize, text))
+        print(
+            f"{name}: {len(text):,} chars  legacy {old * 1000:7.1f} ms  "
+            f"normalize {new * 1000:7.1f} ms  ({old / new:4.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+BOK 보고서 PDF 텍스트 추출 벤치마크.
+
+    python benchmarks/pdf_extract_bench.py report.pdf [workers ...]
+
+기존 단일 extract_text 호출과 bok.pdf_extract.extract_report_text
+(페이지 병렬 + 통계 부록 생략)를 비교하고, 통계 부록을 잘라낸
+결과가 기존과 같은지 확인한다.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "bok"))
+
+from pdfminer.high_level import extract_text  # noqa: E402
+
+import pdf_extract  # noqa: E402
+from normalize import STATISTICS_SECTION as STATISTICS_HEADING  # noqa: E402
+
+
+def timed(fn):
+    t = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - t
+
+
+def body(text: str) -> str:
+    m = STATISTICS_HEADING.search(text)
+    return text[:m.start()] if m else text
+
+
+def main():
+    if len(sys.argv) < 2:
+        sys.exit(__doc__)
+
+    path = sys.argv[1]
+    worker_options = [int(w) for w in sys.argv[2:]] or [1, 2, 4]
+
+    num_pages, statistics_page = pdf_extract.scan_pdf(path)
+    print(f"{path}: {num_pages} pages, statistics appendix at page {statistics_page}")
+
+    baseline, elapsed = timed(lambda: extract_text(path))
+    print(f"  extract_text (single call)      {elapsed:7.2f} s")
+
+    for workers in worker_options:
+        pdf_extract.PDF_WORKERS = workers
+        text, elapsed = timed(lambda: pdf_extract.extract_report_text(path))
+        same = body(text) == body(baseline)
+        print(f"  extract_report_text workers={workers:<2} {elapsed:7.2f} s  same body: {same}")
+
+
+if __name__ == "__main__":
+    main()
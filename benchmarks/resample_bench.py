@@ -0,0 +1,83 @@
+"""
+일봉 → 월/분기/연 리샘플링 벤치마크.
+
+    python benchmarks/resample_bench.py [years]
+
+수십 년치 합성 일봉(결측 포함)으로 기존 Python 루프(Yahoo 월말 종가)와
+common.resample 을 비교한다.
+"""
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "layers", "common", "python"))
+
+from common.resample import AGGREGATIONS, from_epoch, resample  # noqa: E402
+
+REPEAT = 5
+
+
+def synthetic_daily(years: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    start = int(datetime(2026 - years, 1, 1, tzinfo=timezone.utc).timestamp())
+    days = np.arange(years * 365) * 86400 + start
+    # 주말 제외
+    weekday = (days // 86400 + 3) % 7
+    days = days[weekday < 5]
+
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, len(days))))
+    volume = rng.integers(1_000, 100_000, len(days)).astype(float)
+
+    closes = np.round(close, 2).tolist()
+    for i in rng.choice(len(closes), len(closes) // 50, replace=False):
+        closes[i] = None
+    return days.tolist(), closes, volume.tolist()
+
+
+def loop_month_last(timestamps, closes):
+    """기존 yahoo 방식: 봉마다 datetime + strftime"""
+    last = {}
+    for ts, close in zip(timestamps, closes):
+        if close is None:
+            continue
+        ym = datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m")
+        last[ym] = round(float(close), 2)
+    return [{"x": ym, "y": y} for ym, y in sorted(last.items())]
+
+
+def best_of(fn) -> float:
+    timings = []
+    for _ in range(REPEAT):
+        t = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - t)
+    return min(timings)
+
+
+def main():
+    years = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    timestamps, closes, volume = synthetic_daily(years)
+    print(f"{years} years, {len(timestamps):,} daily bars (best of {REPEAT})")
+
+    expected = loop_month_last(timestamps, closes)
+    actual = resample(from_epoch(timestamps), closes, "last", decimals=2)["last"]
+    assert actual == expected, "resample last != loop"
+
+    loop = best_of(lambda: loop_month_last(timestamps, closes))
+    print(f"  python loop   M last       {loop * 1000:8.2f} ms")
+
+    for freq in ("M", "Q", "Y"):
+        elapsed = best_of(lambda: resample(from_epoch(timestamps), closes, "last", freq=freq))
+        print(f"  resample      {freq} last       {elapsed * 1000:8.2f} ms  ({loop / elapsed:5.1f}x)")
+
+    elapsed = best_of(
+        lambda: resample(from_epoch(timestamps), closes, AGGREGATIONS, volume=volume)
+    )
+    print(f"  resample      M all ({len(AGGREGATIONS)})    {elapsed * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
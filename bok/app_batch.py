@@ -1,168 +1,273 @@
 from common.slack import send_slack_message
-from datetime import datetime, timedelta
+from collections.abc import Iterator, Mapping
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import closing
 import json
 import os
+import tempfile
+import time
 
 import boto3
-from boto3.dynamodb.conditions import Key
-from openai import OpenAI
+from boto3.dynamodb.conditions import Attr
+from openai import OpenAI, OpenAIError
+
+from results import add_usage, empty_usage, iter_merged, parse_row, save_to_s3
+import scheduler
+import watch
 
 # ---------------------------
 # Clients
 # ---------------------------
 dynamodb = boto3.resource("dynamodb")
-s3 = boto3.client("s3")
 
 table = dynamodb.Table(os.environ["DDB_TABLE"])
-BUCKET_NAME = os.environ["S3_BUCKET_NAME"]
 
 client = OpenAI(api_key=os.environ["OPENAI_API_KEY"])
 
+SPOOL_DIR = "/tmp"
+JOB_WORKERS = int(os.environ.get("BOK_BATCH_JOB_WORKERS", "4"))
+
 # ---------------------------
-# OpenAI Batch 결과 로딩
+# OpenAI Batch 결과 로딩 (스트리밍)
 # ---------------------------
-def load_batch_output(batch_id: str) -> list[dict]:
-    batch = client.batches.retrieve(batch_id)
-
+# 출력 파일을 줄 단위로 받아 바로 파싱하고, 요약은 /tmp 스풀 파일에 쓴다.
+# 메모리에는 custom_id → (위치, 길이) 색인만 남으므로
+# 최대 사용량은 가장 긴 행 하나 수준이다.
+class SpooledResults(Mapping):
+    """custom_id → 요약. 값은 /tmp 파일에 두고 읽을 때마다 꺼낸다."""
+
+    def __init__(self):
+        self.file = tempfile.TemporaryFile(dir=SPOOL_DIR)
+        self.index = {}
+
+    def add(self, custom_id: str, result: dict):
+        data = json.dumps(result, ensure_ascii=False).encode("utf-8")
+        self.file.seek(0, os.SEEK_END)
+        self.index[custom_id] = (self.file.tell(), len(data))
+        self.file.write(data)
+
+    def __getitem__(self, custom_id: str) -> dict:
+        offset, length = self.index[custom_id]
+        self.file.seek(offset)
+        return json.loads(self.file.read(length))
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def __len__(self):
+        return len(self.index)
+
+    def close(self):
+        self.file.close()
+
+
+def iter_output_rows(file_id: str, stats: dict) -> Iterator[dict]:
+    """출력 JSONL 을 받는 대로 한 줄씩. 깨진 줄은 건너뛰고 stats["invalid_rows"] 에 센다."""
+    with client.files.with_streaming_response.content(file_id) as resp:
+        for line in resp.iter_lines():
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                stats["invalid_rows"] += 1
+                continue
+            if not isinstance(row, dict) or not row.get("custom_id"):
+                stats["invalid_rows"] += 1
+                continue
+            yield row
+
+
+def load_batch_output(batch) -> tuple[SpooledResults, dict]:
+    """완료된 배치 → (custom_id → 요약, 토큰 사용량 · 배치 소요 시간)"""
     if batch.status != "completed":
         raise RuntimeError(f"Batch not completed: {batch.status}")
 
-    output_file = client.files.content(batch.output_file_id)
-    return [json.loads(line) for line in output_file.text.splitlines()]
-
+    stats = {**empty_usage(), "invalid_rows": 0}
+    spool = SpooledResults()
+    try:
+        for row in iter_output_rows(batch.output_file_id, stats):
+            add_usage(stats, row)
+            spool.add(*parse_row(row))
+    except Exception:
+        spool.close()
+        raise
 
-def parse_batch_jsonl(jsonl_rows: list[dict]) -> list[dict]:
-    results = []
+    if batch.created_at and batch.completed_at:
+        stats["batch_seconds"] = int(batch.completed_at - batch.created_at)
+    return spool, stats
 
-    for row in jsonl_rows:
-        custom_id = row.get("custom_id")
-        error = row.get("error")
-        response = row.get("response")
 
-        if error:
-            results.append({
-                "id": custom_id,
-                "error": error,
-            })
-            continue
+# ---------------------------
+# DynamoDB helpers
+# ---------------------------
+def fetch_pending_jobs() -> list[dict]:
+    """
+    code-status-index 의 pending 항목 전체 (월 구분 없이).
+    항목 수가 월 2건 수준이라 인덱스 scan + 필터로 충분하다. LastEvaluatedKey 를 끝까지 따라간다.
+    """
+    kwargs = {
+        "IndexName": "code-status-index",
+        "FilterExpression": Attr("status").eq("pending"),
+    }
 
-        try:
-            content = response["body"]["choices"][0]["message"]["content"]
-            results.append(json.loads(content))
-        except Exception as e:
-            results.append({
-                "id": custom_id,
-                "error": f"json_parse_error: {e}",
-            })
+    jobs = []
+    while True:
+        resp = table.scan(**kwargs)
+        jobs.extend(resp.get("Items", []))
 
-    return results
+        if "LastEvaluatedKey" not in resp:
+            return jobs
+        kwargs["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
 
 
-# ---------------------------
-# DynamoDB helpers
-# ---------------------------
-def fetch_pending_jobs(code: str) -> list[dict]:
-    resp = table.query(
-        IndexName="code-status-index",
-        KeyConditionExpression=Key("code").eq(code) & Key("status").eq("pending"),
-    )
-    return resp.get("Items", [])
+def update_status(code_type: str, new_status: str, usage: dict | None = None):
+    expression = "SET #s = :s"
+    names = {"#s": "status"}
+    values = {":s": new_status}
 
+    if usage:
+        expression += ", #u = :u"
+        names["#u"] = "usage"
+        values[":u"] = usage
 
-def update_status(code_type: str, new_status: str):
     table.update_item(
         Key={"code_type": code_type},
-        UpdateExpression="SET #s = :s",
-        ExpressionAttributeNames={"#s": "status"},
-        ExpressionAttributeValues={":s": new_status},
+        UpdateExpression=expression,
+        ExpressionAttributeNames=names,
+        ExpressionAttributeValues=values,
     )
 
 
 # ---------------------------
-# S3 저장
+# Core Job
 # ---------------------------
-def save_to_s3(code: str, type_: str, results: list[dict]) -> str:
-    key = f"monetary-policy/{code}/{type_}.json"
-
-    s3.put_object(
-        Bucket=BUCKET_NAME,
-        Key=key,
-        Body=json.dumps(results, ensure_ascii=False).encode("utf-8"),
-        ContentType="application/json",
-        CacheControl="max-age=3600",
-    )
-    return key
+def process_job(job: dict) -> dict:
+    """
+    배치 1건을 받아 게시한다 (스레드에서 실행).
+    DynamoDB 갱신은 호출한 쪽에서 한다 — boto3 resource 는 스레드 간 공유하지 않는다.
+    """
+    batch_id = job.get("batch_id")
+    type_ = job["type"]
+    code_type = f"{job['code']}#{type_}"
+
+    # 모든 요청을 요약 캐시로 대신한 경우 batch_id 가 없다
+    batch = client.batches.retrieve(batch_id) if batch_id else None
+    # failed / expired / cancelled 는 아래 load_batch_output 에서 error 로 기록된다
+    if batch and batch.status in watch.RUNNING_STATUSES:
+        if watch.overdue(batch.created_at, time.time()):
+            # 완료 창을 넘겨도 끝나지 않는 배치는 취소하고 error 로 남긴다 (감시 종료).
+            # 다시 돌리려면 DynamoDB 항목을 지운다 → 다음 정기 실행이 다시 제출하고,
+            # 이미 받은 요약은 요약 캐시에서 가져온다.
+            try:
+                client.batches.cancel(batch_id)
+            except OpenAIError:
+                pass
+            raise RuntimeError(
+                f"Batch still {batch.status} after {watch.MAX_RUNNING_SECONDS // 3600}h (cancelled)"
+            )
+
+        # 아직 진행 중이면 건드리지 않고 다음 확인에서 다시 본다
+        return {
+            "code_type": code_type,
+            "batch_id": batch_id,
+            "batch_status": batch.status,
+            "created_at": batch.created_at,
+            "status": "RUNNING",
+        }
 
+    if batch:
+        spool, usage = load_batch_output(batch)
+    else:
+        spool, usage = SpooledResults(), empty_usage()
 
-def get_latest_policy_code(today=None) -> str:
-    today = today or datetime.today()
-    return f"{today.year}-{today.month:02d}"
+    merged = {}
+    with closing(spool):
+        s3_key = save_to_s3(job["code"], type_, iter_merged(job, spool, merged))
 
+    prompt_tokens = usage["prompt_tokens"]
+    return {
+        "code_type": code_type,
+        "batch_id": batch_id,
+        "s3_key": s3_key,
+        "cached": merged["cached"],
+        "usage": usage,
+        "prompt_cache_hit": round(usage["cached_tokens"] / prompt_tokens, 4) if prompt_tokens else 0.0,
+        "status": "SUCCESS",
+    }
 
-# ---------------------------
-# Core Job
-# ---------------------------
-def run():
-    code = get_latest_policy_code()
 
-    pending_jobs = fetch_pending_jobs(code)
+def run():
+    pending_jobs = fetch_pending_jobs()
 
     if not pending_jobs:
         return {
             "status": "NO_DATA",
-            "code": code,
             "reason": "no pending batch jobs",
         }
 
     results = []
 
-    for job in pending_jobs:
-        batch_id = job["batch_id"]
-        type_ = job["type"]
-        code_type = f"{job['code']}#{type_}"
-
-        try:
-            jsonl_rows = load_batch_output(batch_id)
-            parsed = parse_batch_jsonl(jsonl_rows)
-            s3_key = save_to_s3(job["code"], type_, parsed)
-
-            update_status(code_type, "completed")
-
-            results.append({
-                "code_type": code_type,
-                "batch_id": batch_id,
-                "s3_key": s3_key,
-                "status": "SUCCESS",
-            })
-
-        except Exception as e:
-            update_status(code_type, "error")
-            results.append({
-                "code_type": code_type,
-                "batch_id": batch_id,
-                "status": "ERROR",
-                "error": str(e),
-            })
-
+    with ThreadPoolExecutor(max_workers=min(JOB_WORKERS, len(pending_jobs))) as pool:
+        futures = {pool.submit(process_job, job): job for job in pending_jobs}
+
+        for future in as_completed(futures):
+            job = futures[future]
+            code_type = f"{job['code']}#{job['type']}"
+
+            try:
+                result = future.result()
+            except Exception as e:
+                update_status(code_type, "error")
+                results.append({
+                    "code_type": code_type,
+                    "batch_id": job.get("batch_id"),
+                    "status": "ERROR",
+                    "error": str(e),
+                })
+                continue
+
+            if result["status"] == "SUCCESS":
+                update_status(code_type, "completed", usage=result["usage"])
+            results.append(result)
+
+    results.sort(key=lambda r: r["code_type"])
     return {
         "status": "SUCCESS",
-        "code": code,
-        "processed": len(results),
+        "processed": sum(r["status"] != "RUNNING" for r in results),
+        "running": sum(r["status"] == "RUNNING" for r in results),
         "results": results,
     }
 
 
+def schedule_next_check(result: dict, function_arn: str) -> dict | None:
+    """진행 중인 배치가 있으면 상태 · 경과 시간에 맞춰 다음 확인을 예약한다."""
+    running = [
+        {"status": r["batch_status"], "created_at": r["created_at"]}
+        for r in result.get("results", [])
+        if r["status"] == "RUNNING"
+    ]
+
+    delay = watch.plan_next_check(running, time.time())
+    if delay is None:
+        return None
+    return scheduler.schedule_check(delay, target_arn=function_arn)
+
+
 # ---------------------------
 # Lambda Handler
 # ---------------------------
 def lambda_handler(event, context):
     try:
         result = run()
-
-        send_slack_message(
-            service="BOK | Batch Result Processor",
-            result=result
-        )
+        result["watch"] = schedule_next_check(result, context.invoked_function_arn)
+
+        # 감시 실행은 자주 돌므로 처리한 배치가 있을 때만 알린다
+        if not event.get("watch") or result.get("processed"):
+            send_slack_message(
+                service="BOK | Batch Result Processor",
+                result=result
+            )
 
         return {
             "statusCode": 200,
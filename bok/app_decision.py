@@ -1,114 +1,28 @@
 from common.slack import send_slack_message
 import os
-import re
 import json
-import boto3
-from boto3.dynamodb.conditions import Key
-import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin
-from datetime import datetime, timedelta
-
-from pdfminer.high_level import extract_text
-from openai import OpenAI
+from datetime import datetime
+
+from chunking import estimate_tokens
+import jobs
+import listing
+from normalize import (
+    clean_non_text_blocks,
+    cut_statistics_section,
+    normalize_text,
+    remove_table_of_contents,
+    unify_roman_and_symbols,
+)
 
 # --------------------------
-# 0. AWS 클라이언트 초기화
+# 0. 설정
 # --------------------------
-dynamodb = boto3.resource("dynamodb")
-table = dynamodb.Table(os.environ["DDB_TABLE"])
-
-client = OpenAI(api_key=os.environ["OPENAI_API_KEY"])
 BOK_PAGE_URL = os.environ["BOK_PAGE_URL"]
 
 
 # ------------------------
 # 1. 정규화 함수
 # ------------------------
-def normalize_text(text: str) -> str:
-    text = text.replace("ž", "·")
-    lines = text.splitlines()
-    cleaned_lines = []
-
-    line_remove_patterns = [
-        r"^\s*\[?\s*(그림|표)\s*\d+",
-        r"^\s*주\s*[: ]?\s*\d+",
-        r"^\s*(자료|출처)\s*[: ]?",
-        r"^\s*-\s*\d+\s*-",
-    ]
-
-    for line in lines:
-        stripped = line.strip()
-        if not stripped:
-            continue
-        if any(re.search(p, stripped) for p in line_remove_patterns):
-            continue
-        cleaned_lines.append(stripped)
-
-    text = " ".join(cleaned_lines)
-    text = re.sub(r"\d+\)", " ", text)
-    text = re.sub(r"[^\w\s.,!?가-힣()/%\-ⅠⅡⅢⅣⅤⅥⅦⅧⅨⅩ]", " ", text)
-    text = re.sub(r"\s+", " ", text)
-
-    return text.strip()
-
-
-def unify_roman_and_symbols(text: str) -> str:
-    variants_I = [
-        "Ⅰ", "Ｉ", "𝑰", "𝐈", "𝘐", "𝕀", "𝖨", "𝗜", "𝛪",
-    ]
-    for v in variants_I:
-        text = text.replace(v, "I")
-
-    for v in ["–", "—", "−", "﹣", "‐"]:
-        text = text.replace(v, "-")
-
-    for v in ["。", "．", "｡"]:
-        text = text.replace(v, ".")
-
-    return text
-
-
-def remove_table_of_contents(text: str) -> str:
-    m = re.search(r"[ⅠI]\s*-\s*1", text)
-    if m:
-        return text[m.start():]
-    return text
-
-
-def cut_statistics_section(text: str) -> str:
-    m = re.search(r"주요\s*통계\s*및\s*참고", text)
-    if m:
-        return text[:m.start()].strip()
-    return text
-
-
-def clean_non_text_blocks(paragraph: str) -> str:
-    sents = re.split(r"(?<=[.!?])\s+", paragraph)
-    cleaned = []
-
-    for s in sents:
-        s = s.strip()
-        if not s:
-            continue
-
-        if re.search(r"^(그림|표)\s*\d+", s):
-            continue
-        if re.search(r"^주\s*\d+", s):
-            continue
-        if re.search(r"^(자료|출처)[: ]", s):
-            continue
-
-        tokens = s.split()
-        num_tokens = sum(1 for t in tokens if re.match(r"^[\d\.\-,/]+$", t))
-        if len(tokens) > 0 and num_tokens / len(tokens) > 0.6:
-            continue
-
-        cleaned.append(s)
-
-    return " ".join(cleaned).strip()
-
-
 def extract_paragraphs(raw_text: str) -> list[str]:
     # (1) normalize
     text = unify_roman_and_symbols(raw_text)
@@ -122,12 +36,8 @@ def extract_paragraphs(raw_text: str) -> list[str]:
     return cleaned
 
 # ------------------------
-# 2. summary prompt & batch jsonl
+# 2. summary prompt
 # ------------------------
-def estimate_tokens(text: str) -> int:
-    return int(len(text) / 3)
-
-
 def decide_summary_lines(tokens: int) -> str:
     if tokens < 2500:
         return "3 ~ 6"
@@ -137,14 +47,17 @@ def decide_summary_lines(tokens: int) -> str:
         return "8 ~ 10"
 
 
-def build_system_prompt(text: str):
-    tokens = estimate_tokens(text)
-    lines = decide_summary_lines(tokens)
-    return f"""
+# 모든 요청에서 같은 고정 프리픽스 (요청마다 달라지는 값은 user 메시지 끝으로)
+# → 공급자 측 프롬프트 캐시가 시스템 프롬프트·응답 스키마 구간을 재사용한다.
+# 내용이 바뀌면 PROMPT_VERSION 을 올린다.
+PROMPT_VERSION = 2
+PROMPT_CACHE_KEY = f"bok-decision-v{PROMPT_VERSION}"
+
+SYSTEM_PROMPT = """
 당신은 경제 전문가이자 문서 편집자입니다.
 
 주어진 텍스트를 읽고 아래 구조의 JSON만 출력하세요.
-{{"title":"text","summary":["sentence"],"tooltip":{{"keyword":"description"}}}}
+{"title":"text","summary":["sentence"],"tooltip":{"keyword":"description"}}
 
 규칙:
 - JSON 외 다른 텍스트 출력 금지
@@ -157,7 +70,7 @@ title:
 - 명사 중심, 간결한 한국어
 
 summary:
-- {lines}개의 완결된 문장
+- 사용자 메시지 끝의 [요약 문장 수] 만큼의 완결된 문장
 - 중립적·분석적 한국어
 - 정책 판단, 국내·외 경제 여건, 위험 요인을 포괄
 
@@ -176,49 +89,47 @@ token handling:
 - 제목(title)과 요약(summary)은 항상 전체를 유지한다
 """
 
-def create_batch_jsonl(paragraph, output_file="/tmp/batch_input.jsonl"):
-    with open(output_file, "w", encoding="utf-8") as f:
-        prompt = build_system_prompt(paragraph)
-        item = {
-            "custom_id": f"para-0000",
-            "method": "POST",
-            "url": "/v1/chat/completions",
-            "body": {
-                "model": "gpt-5.2",
-                "messages": [
-                    {"role": "system", "content": prompt},
-                    {"role": "user", "content": paragraph},
-                ],
-                "max_completion_tokens": 1000,
-                "temperature": 0,
-                "response_format": {
-                    "type": "json_schema",
-                    "json_schema": {
-                      "name": "paragraph_summary",
-                      "schema": {
-                        "type": "object",
-                        "properties": {
-                            "title": {
-                                "type": "string"
-                            },
-                            "summary": {
-                                "type": "array",
-                                "items": { "type": "string" }
-                            },
-                            "tooltip": {
-                                "type": "object",
-                                "additionalProperties": { "type": "string" }
-                            }
+
+def build_user_message(text: str) -> str:
+    # 문장 수 기준은 길이 추정(len/3)으로 정한 값 → 토크나이저가 바뀌어도 그대로
+    lines = decide_summary_lines(estimate_tokens(text))
+    return f"{text}\n\n[요약 문장 수] {lines}"
+
+
+def build_request(paragraph: str) -> dict:
+    return {
+        "model": "gpt-5.2",
+        "messages": [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": build_user_message(paragraph)},
+        ],
+        "prompt_cache_key": PROMPT_CACHE_KEY,
+        "max_completion_tokens": 1000,
+        "temperature": 0,
+        "response_format": {
+            "type": "json_schema",
+            "json_schema": {
+                "name": "paragraph_summary",
+                "schema": {
+                    "type": "object",
+                    "properties": {
+                        "title": {
+                            "type": "string"
+                        },
+                        "summary": {
+                            "type": "array",
+                            "items": { "type": "string" }
                         },
-                        "required": ["title", "summary"],
-                      }
-                    }
-                  },
-                },
+                        "tooltip": {
+                            "type": "object",
+                            "additionalProperties": { "type": "string" }
+                        }
+                    },
+                    "required": ["title", "summary"],
+                }
             }
-        f.write(json.dumps(item, ensure_ascii=False) + "\n")
-
-    return output_file
+        },
+    }
 
 
 PUBLISH_DATES = [
@@ -252,26 +163,8 @@ def get_target_report_month(today=None):
 
 
 def extract_pdf_links(page_url):
-    soup = BeautifulSoup(requests.get(page_url).text, "html.parser")
-    rows = soup.select("table#tableId tbody tr")
-
-    pdf_links = []
-    for row in rows:
-        tds = row.find_all("td")
-        if not tds:
-            continue
-
-        link = tds[1].select_one(
-            "div.fileGoupBox ul li:nth-of-type(2) a.i-download[href]"
-        )
-        if not link:
-            continue
-
-        pdf_links.append({
-            "filename": link.get_text(strip=True),
-            "url": urljoin(page_url, link["href"]),
-        })
-    return pdf_links
+    # 목록 페이지는 조건부 GET + 파싱 결과 캐시 (issue / decision 공용)
+    return listing.get_pdf_links(page_url, "decision")
 
 
 def should_download_today(today=None):
@@ -292,47 +185,6 @@ def should_download_today(today=None):
     return None
 
 
-def download_pdf(pdf_url, filename):
-    path = f"/tmp/{filename}"
-    r = requests.get(pdf_url, timeout=10)
-    r.raise_for_status()
-    with open(path, "wb") as f:
-        f.write(r.content)
-    return path
-
-
-def submit_batch(file_path):
-    batch_input = client.files.create(
-        file=open(file_path, "rb"),
-        purpose="batch",
-    )
-    return client.batches.create(
-        input_file_id=batch_input.id,
-        endpoint="/v1/chat/completions",
-        completion_window="24h",
-    )
-
-
-def exists_batch(code, type_):
-    resp = table.query(
-        KeyConditionExpression=Key("code_type").eq(f"{code}#{type_}")
-    )
-    return resp["Count"] > 0
-
-
-def save_batch(batch_id, code, type_):
-    table.put_item(
-        Item={
-            "code_type": f"{code}#{type_}",
-            "code": code,
-            "type": type_,
-            "batch_id": batch_id,
-            "status": "pending",
-            "created_at": datetime.utcnow().isoformat(),
-        }
-    )
-
-
 def run():
     pdf_info = should_download_today()
 
@@ -342,27 +194,24 @@ def run():
             "reason": "no pdf today",
         }
 
-    if exists_batch(pdf_info["code"], "bok-decision"):
+    if jobs.exists_batch(pdf_info["code"], "bok-decision"):
         return {
             "status": "NO_DATA",
             "reason": "already processed",
             "code": pdf_info["code"],
         }
 
-    pdf_path = download_pdf(pdf_info["url"], pdf_info["filename"])
-
-    raw_text = extract_text(pdf_path)
-    paragraph = extract_paragraphs(raw_text)
-
-    jsonl_path = create_batch_jsonl(paragraph)
-    batch = submit_batch(jsonl_path)
+    pdf_sha, paragraph = jobs.load_paragraphs(pdf_info, "bok-decision", extract_paragraphs)
 
-    save_batch(batch.id, pdf_info["code"], "bok-decision")
+    # 단일 요청이라 보통 직접 호출로 바로 게시된다
+    batch_requests = [("para-0000", build_request(paragraph))]
+    dispatched = jobs.dispatch_requests(pdf_info["code"], "bok-decision", batch_requests)
 
     return {
         "status": "SUCCESS",
-        "batch_id": batch.id,
+        **dispatched,
         "code": pdf_info["code"],
+        "pdf_sha256": pdf_sha,
         "paragraphs": len(paragraph),
     }
 
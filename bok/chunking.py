@@ -0,0 +1,154 @@
+import hashlib
+import os
+
+from normalize import SENTENCE_SPLIT
+
+try:
+    import tiktoken
+except ImportError:  # BOK_TOKENIZER=len/3 일 때만 없어도 된다
+    tiktoken = None
+
+# --------------------------
+# 토큰 기준 문단 분할 · 병합
+# --------------------------
+# 토크나이저 BPE 파일은 배포 패키지에 같이 넣는다 (실행 중 네트워크 호출 없음).
+#   TIKTOKEN_CACHE_DIR=bok/tiktoken_cache python -c \
+#     "import tiktoken; tiktoken.get_encoding('o200k_base')"
+# sam build (bok/Makefile) 가 받아서 넣고, 토크나이저를 쓰는 함수는 콜드 스타트에서
+# check_tokenizer() 로 확인한다 (파일이 없으면 바로 실패).
+# 길이 기반 추정(len(text) / 3)은 BOK_TOKENIZER=len/3 으로 명시했을 때만 쓴다.
+
+ENCODING_NAME = "o200k_base"
+ENCODING_URL = "https://openaipublic.blob.core.windows.net/encodings/o200k_base.tiktoken"
+ESTIMATE_TOKENIZER = "len/3"
+
+TOKENIZER = os.environ.get("BOK_TOKENIZER", ENCODING_NAME)
+
+TOKENIZER_DIR = os.environ.get(
+    "TIKTOKEN_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "tiktoken_cache"),
+)
+
+# 이보다 긴 문단은 문장 경계에서 나눈다
+MAX_CHUNK_TOKENS = 6000
+# 이보다 짧은 문단은 이웃 문단과 합친다 (합친 결과는 TARGET 이하)
+MIN_CHUNK_TOKENS = 800
+TARGET_CHUNK_TOKENS = 3000
+
+_encoding = None
+
+
+def encoding_file() -> str:
+    return os.path.join(TOKENIZER_DIR, hashlib.sha1(ENCODING_URL.encode()).hexdigest())
+
+
+def check_tokenizer(tokenizer: str = TOKENIZER):
+    """설정한 토크나이저를 쓸 수 없으면 RuntimeError (조용히 추정으로 넘어가지 않는다)."""
+    if tokenizer == ESTIMATE_TOKENIZER:
+        return
+    if tokenizer != ENCODING_NAME:
+        raise RuntimeError(
+            f"BOK_TOKENIZER must be {ENCODING_NAME} or {ESTIMATE_TOKENIZER}: {tokenizer}"
+        )
+    if tiktoken is None:
+        raise RuntimeError("tiktoken is not installed (set BOK_TOKENIZER=len/3 to estimate)")
+    if not os.path.exists(encoding_file()):
+        raise RuntimeError(
+            f"{ENCODING_NAME} BPE file is missing from {TOKENIZER_DIR}; "
+            "build with sam build, which fetches it via bok/Makefile (set BOK_TOKENIZER=len/3 to estimate)"
+        )
+
+
+def load_encoding():
+    """o200k_base 설정이면 번들된 BPE 파일로 tiktoken 을 쓴다 (len/3 설정이면 None)."""
+    global _encoding
+    if _encoding is not None or TOKENIZER == ESTIMATE_TOKENIZER:
+        return _encoding
+
+    check_tokenizer()
+    os.environ["TIKTOKEN_CACHE_DIR"] = TOKENIZER_DIR
+    _encoding = tiktoken.get_encoding(ENCODING_NAME)
+    return _encoding
+
+
+def tokenizer_name() -> str:
+    return ENCODING_NAME if load_encoding() else ESTIMATE_TOKENIZER
+
+
+def estimate_tokens(text: str) -> int:
+    """길이 기반 추정 (토크나이저와 무관하게 같은 값)"""
+    return int(len(text) / 3)
+
+
+def count_tokens(text: str) -> int:
+    encoding = load_encoding()
+    if encoding is None:
+        return estimate_tokens(text)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def split_oversized(paragraph: str, max_tokens: int = MAX_CHUNK_TOKENS) -> list[str]:
+    """
+    max_tokens 를 넘는 문단을 문장 단위로 채워 나눈다.
+    문장 하나가 max_tokens 를 넘으면 그 문장은 그대로 한 덩어리.
+    """
+    if count_tokens(paragraph) <= max_tokens:
+        return [paragraph]
+
+    chunks, current, current_tokens = [], [], 0
+    for sentence in SENTENCE_SPLIT.split(paragraph):
+        # +1: 이어 붙일 때의 공백
+        tokens = count_tokens(sentence) + 1
+        if current and current_tokens + tokens > max_tokens:
+            chunks.append(" ".join(current))
+            current, current_tokens = [], 0
+        current.append(sentence)
+        current_tokens += tokens
+
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def pack_small(
+    chunks: list[str],
+    min_tokens: int = MIN_CHUNK_TOKENS,
+    target_tokens: int = TARGET_CHUNK_TOKENS,
+) -> list[str]:
+    """짧은 문단을 바로 옆 문단과 target_tokens 이내로 합친다 (순서 유지)."""
+    packed, sizes = [], []
+    for chunk in chunks:
+        tokens = count_tokens(chunk) + 1
+        if (
+            packed
+            and sizes[-1] + tokens <= target_tokens
+            and (sizes[-1] < min_tokens or tokens < min_tokens)
+        ):
+            packed[-1] = f"{packed[-1]} {chunk}"
+            sizes[-1] += tokens
+        else:
+            packed.append(chunk)
+            sizes.append(tokens)
+    return packed
+
+
+def chunk_paragraphs(paragraphs: list[str], overhead_tokens: int = 0) -> tuple[list[str], dict]:
+    """
+    문단 → 요청 단위 청크, 절감 통계.
+    overhead_tokens 는 요청마다 붙는 고정 입력(시스템 프롬프트 등) 토큰 수.
+    """
+    # 빈 문단도 지금까지는 요청 1건이었으므로 절감 기준에는 포함
+    split = [chunk for p in paragraphs if p.strip() for chunk in split_oversized(p)]
+    chunks = pack_small(split)
+
+    before = sum(count_tokens(p) for p in paragraphs) + overhead_tokens * len(paragraphs)
+    after = sum(count_tokens(c) for c in chunks) + overhead_tokens * len(chunks)
+
+    return chunks, {
+        "tokenizer": tokenizer_name(),
+        "paragraphs": len(paragraphs),
+        "requests": len(chunks),
+        "input_tokens": after,
+        "saved_requests": len(paragraphs) - len(chunks),
+        "saved_tokens": before - after,
+    }
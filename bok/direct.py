@@ -0,0 +1,97 @@
+import asyncio
+import os
+import random
+
+import openai
+from openai import AsyncOpenAI
+
+from results import collect_usage, parse_batch_jsonl
+
+# 요청 수가 이 이하면 배치(24h) 대신 바로 호출한다
+DIRECT_MAX_REQUESTS = int(os.environ.get("BOK_DIRECT_MAX_REQUESTS", "8"))
+DIRECT_CONCURRENCY = int(os.environ.get("BOK_DIRECT_CONCURRENCY", "4"))
+# 직접 호출 전체에 쓰는 시간 (Lambda 제한 시간 안에서). 넘기면 남은 요청은 배치로
+DIRECT_BUDGET_SECONDS = int(os.environ.get("BOK_DIRECT_BUDGET_SECONDS", "120"))
+
+DIRECT_ATTEMPTS = 3
+REQUEST_TIMEOUT = 60
+MAX_BACKOFF_SECONDS = 20
+
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+
+# --------------------------
+# 직접 호출 모드 (chat.completions, 동시 실행 제한 · 재시도)
+# --------------------------
+# 응답은 배치 출력과 같은 행 모양으로 만들어 results 모듈의 파싱 · 사용량 집계를 그대로 쓴다.
+# 끝내 실패했거나 시간 안에 끝나지 않은 요청은 호출한 쪽에서 배치로 넘긴다.
+
+
+def use_direct(requests: list) -> bool:
+    return 0 < len(requests) <= DIRECT_MAX_REQUESTS
+
+
+def error_row(custom_id: str, e: Exception) -> dict:
+    return {
+        "custom_id": custom_id,
+        "response": None,
+        "error": {"type": type(e).__name__, "message": str(e)},
+    }
+
+
+async def complete(client, semaphore, custom_id: str, body: dict) -> dict:
+    for attempt in range(1, DIRECT_ATTEMPTS + 1):
+        try:
+            async with semaphore:
+                completion = await client.chat.completions.create(**body)
+            return {
+                "custom_id": custom_id,
+                "response": {"status_code": 200, "body": completion.model_dump()},
+                "error": None,
+            }
+        except RETRYABLE_ERRORS as e:
+            if attempt == DIRECT_ATTEMPTS:
+                return error_row(custom_id, e)
+            # 대기는 세마포어 밖에서 (다른 요청은 계속 진행)
+            await asyncio.sleep(min(2 ** attempt, MAX_BACKOFF_SECONDS) + random.random())
+        except openai.APIStatusError as e:
+            # 4xx 등 재시도해도 같은 결과
+            return error_row(custom_id, e)
+
+
+async def complete_all(requests: list[tuple[str, dict]], budget_seconds: float) -> list[dict]:
+    semaphore = asyncio.Semaphore(DIRECT_CONCURRENCY)
+
+    async with AsyncOpenAI(
+        api_key=os.environ["OPENAI_API_KEY"],
+        timeout=REQUEST_TIMEOUT,
+        max_retries=0,  # 재시도는 complete() 에서
+    ) as client:
+        tasks = [
+            asyncio.create_task(complete(client, semaphore, cid, body))
+            for cid, body in requests
+        ]
+        done, not_done = await asyncio.wait(tasks, timeout=budget_seconds)
+        for task in not_done:
+            task.cancel()
+
+    return [task.result() for task in done]
+
+
+def summarize(
+    requests: list[tuple[str, dict]],
+    budget_seconds: float = DIRECT_BUDGET_SECONDS,
+) -> tuple[dict[str, dict], list[tuple[str, dict]], dict]:
+    """
+    반환: (custom_id → 요약, 배치로 넘길 요청, 토큰 사용량)
+    """
+    rows = asyncio.run(complete_all(requests, budget_seconds))
+    parsed = parse_batch_jsonl(rows)
+
+    answered = {cid: result for cid, result in parsed.items() if "error" not in result}
+    failed = [(cid, body) for cid, body in requests if cid not in answered]
+    return answered, failed, collect_usage(rows)
@@ -0,0 +1,181 @@
+import hashlib
+import json
+import os
+
+import requests
+
+PARTIAL_DIR = "/tmp/bok-cache/partial"
+
+CHUNK_SIZE = 1 << 20
+DOWNLOAD_ATTEMPTS = 3
+# (연결, 청크 사이 대기) — 전체 다운로드 시간 제한이 아니다
+TIMEOUT = (10, 60)
+
+# 이어받기 offset · 크기 검사는 전송 바이트 기준이므로 압축 전송을 받지 않는다
+# (gzip 이면 iter_content 가 풀어 준 크기와 Range · Content-Length 가 어긋난다)
+IDENTITY = {"Accept-Encoding": "identity"}
+
+RETRYABLE_ERRORS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.ChunkedEncodingError,
+    requests.exceptions.Timeout,
+)
+
+
+# --------------------------
+# 스트리밍 다운로드 (SHA-256 동시 계산 · Range 이어받기)
+# --------------------------
+# 받는 중인 파일은 URL 해시 이름의 .part 로 두고,
+# 끊기면 같은 실행의 재시도나 다음 실행(웜 컨테이너)에서 Range 로 이어받는다.
+# 경로는 페이지 텍스트(파일명)를 쓰지 않고 해시로만 만든다.
+#
+# 처음 받을 때의 검증자(강한 ETag 또는 Last-Modified)와 전체 크기를 .part.json 에 두고
+# 이어받을 때 If-Range 로 보낸다. 그 사이 PDF 가 바뀌었으면 서버가 200 으로 전체를 주므로
+# 처음부터 다시 받는다 (옛 앞부분 + 새 뒷부분이 이어 붙어 캐시 키가 되는 일이 없도록).
+
+PDF_MAGIC = b"%PDF-"
+
+
+def partial_path(url: str) -> str:
+    return os.path.join(PARTIAL_DIR, f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.part")
+
+
+def meta_path(path: str) -> str:
+    return f"{path}.json"
+
+
+def load_meta(path: str) -> dict:
+    try:
+        with open(meta_path(path), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_meta(path: str, resp, total: int | None):
+    etag = resp.headers.get("ETag")
+    meta = {
+        # If-Range 에는 약한 ETag(W/...)를 쓸 수 없다
+        "validator": etag if etag and not etag.startswith("W/") else resp.headers.get("Last-Modified"),
+        "total": total,
+    }
+    with open(meta_path(path), "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+
+
+def discard(path: str):
+    for p in (path, meta_path(path)):
+        if os.path.exists(p):
+            os.remove(p)
+
+
+def hash_existing(path: str, h) -> int:
+    """이미 받은 부분을 해시에 반영하고 크기를 돌려준다."""
+    if not os.path.exists(path):
+        return 0
+
+    size = 0
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(CHUNK_SIZE), b""):
+            h.update(block)
+            size += len(block)
+    return size
+
+
+def total_size(resp, offset: int) -> int | None:
+    """Content-Range (bytes a-b/N) 또는 Content-Length 로 전체 크기"""
+    content_range = resp.headers.get("Content-Range", "")
+    if "/" in content_range:
+        total = content_range.rsplit("/", 1)[1]
+        return int(total) if total.isdigit() else None
+
+    length = resp.headers.get("Content-Length")
+    return offset + int(length) if length and length.isdigit() else None
+
+
+def range_start(resp) -> int | None:
+    """Content-Range: bytes a-b/N → a"""
+    unit, _, spec = resp.headers.get("Content-Range", "").partition(" ")
+    start = spec.split("-", 1)[0]
+    return int(start) if unit == "bytes" and start.isdigit() else None
+
+
+def fetch_to(url: str, path: str) -> str:
+    """
+    path 에 이어서 받고 완료되면 SHA-256 을 돌려준다.
+    처음 받은 응답과 같은 파일일 때만(If-Range) 이어받고, 아니면 처음부터 다시 받는다.
+    """
+    meta = load_meta(path)
+    if not meta.get("validator"):
+        # 이어받을 근거가 없는 .part 는 버린다
+        discard(path)
+
+    h = hashlib.sha256()
+    offset = hash_existing(path, h)
+
+    headers = IDENTITY
+    if offset:
+        headers = {**IDENTITY, "Range": f"bytes={offset}-", "If-Range": meta["validator"]}
+
+    with requests.get(url, headers=headers, stream=True, timeout=TIMEOUT) as resp:
+        if resp.status_code == 416:
+            # 이미 끝까지 받은 상태 (검증자가 달랐다면 416 이 아니라 200 이 온다)
+            if total_size(resp, 0) == offset == meta.get("total"):
+                return h.hexdigest()
+            discard(path)
+            return fetch_to(url, path)
+
+        resp.raise_for_status()
+
+        encoding = resp.headers.get("Content-Encoding", "identity").strip().lower()
+        if encoding != "identity":
+            raise requests.exceptions.ContentDecodingError(
+                f"server ignored Accept-Encoding: identity ({encoding})"
+            )
+
+        if offset and resp.status_code == 206:
+            if range_start(resp) != offset or total_size(resp, offset) != meta.get("total"):
+                # 요청한 위치 · 크기와 다른 조각이면 이어 붙이지 않는다
+                discard(path)
+                return fetch_to(url, path)
+        else:
+            # 처음 받거나, 파일이 바뀌어 서버가 전체(200)를 준 경우
+            h, offset = hashlib.sha256(), 0
+            save_meta(path, resp, total_size(resp, 0))
+
+        expected = total_size(resp, offset)
+        with open(path, "ab" if offset else "wb") as f:
+            for chunk in resp.iter_content(chunk_size=CHUNK_SIZE):
+                f.write(chunk)
+                h.update(chunk)
+                offset += len(chunk)
+
+    if expected is not None and offset != expected:
+        raise requests.exceptions.ChunkedEncodingError(
+            f"incomplete download: {offset} / {expected} bytes"
+        )
+
+    with open(path, "rb") as f:
+        if f.read(len(PDF_MAGIC)) != PDF_MAGIC:
+            discard(path)
+            raise ValueError(f"downloaded file is not a PDF: {url}")
+    return h.hexdigest()
+
+
+def download_pdf(url: str) -> tuple[str, str]:
+    """
+    반환: (SHA-256, 받은 파일 경로)
+    파일은 호출한 쪽에서 내용 주소 경로로 옮긴다 (report_cache.store_pdf).
+    """
+    os.makedirs(PARTIAL_DIR, exist_ok=True)
+    path = partial_path(url)
+
+    for attempt in range(1, DOWNLOAD_ATTEMPTS + 1):
+        try:
+            sha = fetch_to(url, path)
+            # .part 는 호출한 쪽이 옮기므로 이어받기 정보만 지운다
+            os.remove(meta_path(path))
+            return sha, path
+        except RETRYABLE_ERRORS:
+            if attempt == DOWNLOAD_ATTEMPTS:
+                raise
@@ -0,0 +1,188 @@
+import os
+import json
+from collections.abc import Callable
+from datetime import datetime
+
+import boto3
+from boto3.dynamodb.conditions import Key
+from openai import OpenAI
+
+from direct import summarize as summarize_direct, use_direct
+from download import download_pdf
+from pdf_extract import extract_report_text
+import report_cache
+from results import merge_results, save_to_s3
+from scheduler import schedule_check
+import summary_cache
+import watch
+
+# --------------------------
+# BOK 요약 작업 제출 (app_issue / app_decision 공용)
+# --------------------------
+# 보고서마다 다른 것은 문단 추출(extract_paragraphs)과 요청 본문뿐이고,
+# 캐시 · 직접 호출 · 배치 제출 · 작업 저장은 type_ ("bok-issue" / "bok-decision") 으로 나눈다.
+
+dynamodb = boto3.resource("dynamodb")
+table = dynamodb.Table(os.environ["DDB_TABLE"])
+
+client = OpenAI(api_key=os.environ["OPENAI_API_KEY"])
+
+
+# ------------------------
+# 1. 문단 (PDF 캐시)
+# ------------------------
+def load_paragraphs(
+    pdf_info: dict,
+    type_: str,
+    extract_paragraphs: Callable[[str], list | str],
+) -> tuple[str, list | str]:
+    """
+    PDF SHA-256 기준 캐시(/tmp → S3)를 거쳐 문단을 얻는다.
+    재시도 시 다운로드와 pdfminer 추출을 모두 건너뛴다.
+    """
+    sha = report_cache.lookup_url(pdf_info["url"])
+    if sha is None:
+        # 스트리밍으로 받으며 해시 계산 → 내용 주소 경로로 이동
+        sha, pdf_path = download_pdf(pdf_info["url"])
+        sha = report_cache.store_pdf(pdf_info["url"], pdf_path, sha)
+
+    def raw_text():
+        return report_cache.cached_text(
+            sha,
+            report_cache.RAW_TEXT_NAME,
+            lambda: extract_report_text(report_cache.get_file(sha, report_cache.PDF_NAME)),
+        )
+
+    paragraphs = report_cache.cached_json(
+        sha,
+        report_cache.paragraphs_name(type_),
+        lambda: extract_paragraphs(raw_text()),
+    )
+    return sha, paragraphs
+
+
+# ------------------------
+# 2. Batch 제출
+# ------------------------
+def create_batch_jsonl(requests: list[tuple[str, dict]], output_file="/tmp/batch_input.jsonl"):
+    with open(output_file, "w", encoding="utf-8") as f:
+        for custom_id, body in requests:
+            item = {
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": body,
+            }
+            f.write(json.dumps(item, ensure_ascii=False) + "\n")
+
+    return output_file
+
+
+def submit_batch(file_path):
+    batch_input = client.files.create(
+        file=open(file_path, "rb"),
+        purpose="batch",
+    )
+    return client.batches.create(
+        input_file_id=batch_input.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+    )
+
+
+# ------------------------
+# 3. 작업 기록 (DynamoDB)
+# ------------------------
+def exists_batch(code, type_):
+    resp = table.query(
+        KeyConditionExpression=Key("code_type").eq(f"{code}#{type_}")
+    )
+    return resp["Count"] > 0
+
+
+def save_batch(
+    batch_id: str | None,
+    code: str,
+    type_: str,
+    request_ids: list[str],
+    cache_keys: list[str],
+    cached_ids: list[str],
+    status: str = "pending",
+    usage: dict | None = None,
+) -> dict:
+    """
+    request_ids / cache_keys 는 요청 순서 그대로,
+    cached_ids 는 요약 캐시로 대신한 요청 (app_batch 에서 합친다).
+    전부 캐시 · 직접 호출로 끝냈으면 batch_id 없이 저장한다.
+    """
+    item = {
+        "code_type": f"{code}#{type_}",
+        "code": code,
+        "type": type_,
+        "status": status,
+        "request_ids": request_ids,
+        "cache_keys": cache_keys,
+        "cached_ids": cached_ids,
+        "created_at": datetime.utcnow().isoformat(),
+    }
+    if batch_id:
+        item["batch_id"] = batch_id
+    if usage:
+        item["usage"] = usage
+
+    table.put_item(Item=item)
+    return item
+
+
+# ------------------------
+# 4. 요청 처리 (캐시 → 직접 호출 → 배치)
+# ------------------------
+def dispatch_requests(code: str, type_: str, batch_requests: list[tuple[str, dict]]) -> dict:
+    """
+    요약 캐시 → 직접 호출 → 배치 순으로 요청을 처리한다.
+    모두 끝나면 바로 monetary-policy/{code}/{type}.json 으로 게시하고,
+    남은 요청이 있을 때만 배치로 넘긴다.
+    """
+    request_ids = [custom_id for custom_id, _ in batch_requests]
+
+    # 이미 요약한 문단(같은 모델·프롬프트)은 뺀다
+    pending, cache_keys, cached_ids = summary_cache.split_cached(batch_requests)
+
+    # 요청이 적으면 바로 호출하고, 실패했거나 시간 안에 못 받은 요청만 배치로 넘긴다
+    answered, usage = {}, None
+    if use_direct(pending):
+        answered, pending, usage = summarize_direct(pending)
+
+    if not pending:
+        job = {"request_ids": request_ids, "cache_keys": cache_keys, "cached_ids": cached_ids}
+        results, _ = merge_results(job, answered)
+        s3_key = save_to_s3(code, type_, results)
+        save_batch(
+            None, code, type_, request_ids, cache_keys, cached_ids,
+            status="completed", usage=usage,
+        )
+        return {
+            "mode": "direct" if answered else "cache",
+            "batch_id": None,
+            "s3_key": s3_key,
+            "cached": len(cached_ids),
+            "direct": len(answered),
+            "usage": usage,
+        }
+
+    # 직접 받은 요약은 캐시에 넣어 두고 app_batch 가 캐시 결과와 함께 합친다
+    keys_by_id = dict(zip(request_ids, cache_keys))
+    for custom_id, result in answered.items():
+        summary_cache.store(keys_by_id[custom_id], result)
+
+    batch_id = submit_batch(create_batch_jsonl(pending)).id
+    save_batch(batch_id, code, type_, request_ids, cache_keys, cached_ids + list(answered))
+    return {
+        "mode": "batch",
+        "batch_id": batch_id,
+        "cached": len(cached_ids),
+        "direct": len(answered),
+        "usage": usage,
+        # 배치 결과 처리 함수가 완료될 때까지 스스로 다음 확인을 예약한다
+        "watch": schedule_check(watch.MIN_DELAY_SECONDS),
+    }
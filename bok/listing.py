@@ -0,0 +1,133 @@
+import hashlib
+import json
+from datetime import datetime
+from urllib.parse import urljoin
+
+import requests
+from bs4 import BeautifulSoup
+
+import report_cache
+
+try:
+    import lxml  # noqa: F401
+    PARSER = "lxml"
+except ImportError:  # lxml 이 없으면 내장 파서
+    PARSER = "html.parser"
+
+LISTING_PREFIX = f"{report_cache.CACHE_PREFIX}/listing"
+
+# 같은 목록 페이지에서 함수별로 고르는 다운로드 링크
+# name → (td 위치, CSS selector)
+LINK_SELECTORS = {
+    "issue": (-1, "div.fileGoupBox li.ajasOpen5Btn a.i-download[href]"),
+    "decision": (1, "div.fileGoupBox ul li:nth-of-type(2) a.i-download[href]"),
+}
+
+# --------------------------
+# 목록 페이지 캐시
+# --------------------------
+# bok-cache/listing/{sha256(url)}.json
+# {
+#   "url": ..., "etag": ..., "last_modified": ..., "body_sha256": ...,
+#   "checked_at": ..., "parsed_at": ...,
+#   "links": {"issue": [{filename, url}], "decision": [...]}
+# }
+#
+# ETag / Last-Modified 로 조건부 GET → 304 면 저장된 링크 사용.
+# 검증자를 주지 않는 서버면 본문 해시가 같을 때 파싱을 건너뛴다.
+
+
+def listing_key(page_url: str) -> str:
+    return f"{LISTING_PREFIX}/{hashlib.sha256(page_url.encode('utf-8')).hexdigest()}.json"
+
+
+def load_listing(page_url: str) -> dict | None:
+    body = report_cache.get_object(listing_key(page_url))
+    if body is None:
+        return None
+
+    cached = json.loads(body)
+    # 선택자가 추가되었으면 다시 파싱
+    if set(cached.get("links", {})) != set(LINK_SELECTORS):
+        return None
+    return cached
+
+
+def save_listing(page_url: str, listing: dict):
+    report_cache.s3.put_object(
+        Bucket=report_cache.CACHE_BUCKET,
+        Key=listing_key(page_url),
+        Body=json.dumps(listing, ensure_ascii=False).encode("utf-8"),
+        ContentType="application/json",
+    )
+
+
+def parse_links(html: bytes, page_url: str) -> dict[str, list]:
+    soup = BeautifulSoup(html, PARSER)
+    rows = soup.select("table#tableId tbody tr")
+
+    links = {name: [] for name in LINK_SELECTORS}
+    for row in rows:
+        tds = row.find_all("td")
+        if not tds:
+            continue
+
+        for name, (position, selector) in LINK_SELECTORS.items():
+            if not -len(tds) <= position < len(tds):
+                continue
+
+            link = tds[position].select_one(selector)
+            if not link:
+                continue
+
+            links[name].append({
+                "filename": link.get_text(strip=True),
+                "url": urljoin(page_url, link["href"]),
+            })
+    return links
+
+
+def fetch_listing(page_url: str) -> dict:
+    cached = load_listing(page_url)
+
+    headers = {}
+    if cached and cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+    if cached and cached.get("last_modified"):
+        headers["If-Modified-Since"] = cached["last_modified"]
+
+    resp = requests.get(page_url, headers=headers, timeout=10)
+    now = datetime.utcnow().isoformat()
+
+    if resp.status_code == 304 and cached:
+        return {**cached, "checked_at": now, "changed": False}
+
+    resp.raise_for_status()
+
+    body_sha = hashlib.sha256(resp.content).hexdigest()
+    if cached and cached.get("body_sha256") == body_sha:
+        links, parsed_at, changed = cached["links"], cached.get("parsed_at"), False
+    else:
+        links, parsed_at, changed = parse_links(resp.content, page_url), now, True
+
+    listing = {
+        "url": page_url,
+        "etag": resp.headers.get("ETag"),
+        "last_modified": resp.headers.get("Last-Modified"),
+        "body_sha256": body_sha,
+        "checked_at": now,
+        "parsed_at": parsed_at,
+        "links": links,
+    }
+
+    # 검증자나 링크가 바뀐 경우에만 캐시를 다시 쓴다
+    if not cached or changed or any(
+        cached.get(k) != listing[k] for k in ("etag", "last_modified")
+    ):
+        save_listing(page_url, listing)
+
+    return {**listing, "changed": changed}
+
+
+def get_pdf_links(page_url: str, name: str) -> list[dict]:
+    return fetch_listing(page_url)["links"][name]
@@ -0,0 +1,99 @@
+import re
+
+# ------------------------
+# BOK 보고서 텍스트 정규화 (app_issue / app_decision 공용)
+# ------------------------
+# 패턴은 모듈 로드 시 한 번만 컴파일하고,
+# 줄/문장 단위 제거 규칙은 하나의 alternation 으로 묶어 한 번만 검사한다.
+
+# 로마 숫자 I 변형 · 대시 · 마침표 → ASCII
+# str.translate 는 한글 위주 텍스트에서 문자마다 dict 조회를 해 오히려 느리다.
+# (14만 자 기준 translate ~19ms, 문자별 str.replace ~0.3ms)
+SYMBOL_MAP = {
+    **{v: "I" for v in ["Ⅰ", "Ｉ", "𝑰", "𝐈", "𝘐", "𝕀", "𝖨", "𝗜", "𝛪"]},
+    **{v: "-" for v in ["–", "—", "−", "﹣", "‐"]},
+    **{v: "." for v in ["。", "．", "｡"]},
+}
+
+# 그림/표 제목, 주석, 자료 출처, 쪽 번호 줄
+LINE_REMOVE = re.compile(
+    r"\s*(?:"
+    r"\[?\s*(?:그림|표)\s*\d+"
+    r"|주\s*[: ]?\s*\d+"
+    r"|(?:자료|출처)\s*[: ]?"
+    r"|-\s*\d+\s*-"
+    r")"
+)
+
+FOOTNOTE_MARK = re.compile(r"\d+\)")
+
+# 허용 문자 이외의 문자와 공백이 이어진 구간 → 공백 1칸
+# (허용하지 않는 문자를 공백으로 바꾼 뒤 \s+ 를 접는 것과 같다)
+DISALLOWED_OR_SPACE = re.compile(r"[^\w.,!?가-힣()/%\-ⅠⅡⅢⅣⅤⅥⅦⅧⅨⅩ]+")
+
+TABLE_OF_CONTENTS_END = re.compile(r"[ⅠI]\s*-\s*1")
+STATISTICS_SECTION = re.compile(r"주요\s*통계\s*및\s*참고")
+
+SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
+
+SENTENCE_REMOVE = re.compile(r"(?:그림|표)\s*\d+|주\s*\d+|(?:자료|출처)[: ]")
+
+# 공백으로 구분된 토큰 전체가 숫자·기호로만 이루어진 경우
+NUMERIC_TOKEN = re.compile(r"(?<!\S)[\d.\-,/]+(?!\S)")
+NUMERIC_RATIO_LIMIT = 0.6
+
+
+def unify_roman_and_symbols(text: str) -> str:
+    for src, dst in SYMBOL_MAP.items():
+        text = text.replace(src, dst)
+    return text
+
+
+def normalize_text(text: str) -> str:
+    text = text.replace("ž", "·")
+
+    cleaned_lines = []
+    for line in text.splitlines():
+        stripped = line.strip()
+        if stripped and not LINE_REMOVE.match(stripped):
+            cleaned_lines.append(stripped)
+
+    text = " ".join(cleaned_lines)
+    text = FOOTNOTE_MARK.sub(" ", text)
+    text = DISALLOWED_OR_SPACE.sub(" ", text)
+
+    return text.strip()
+
+
+def remove_table_of_contents(text: str) -> str:
+    m = TABLE_OF_CONTENTS_END.search(text)
+    if m:
+        return text[m.start():]
+    return text
+
+
+def cut_statistics_section(text: str) -> str:
+    m = STATISTICS_SECTION.search(text)
+    if m:
+        return text[:m.start()].strip()
+    return text
+
+
+def clean_non_text_blocks(paragraph: str) -> str:
+    cleaned = []
+
+    for s in SENTENCE_SPLIT.split(paragraph):
+        s = s.strip()
+        if not s:
+            continue
+
+        if SENTENCE_REMOVE.match(s):
+            continue
+
+        num_tokens = len(s.split())
+        if num_tokens and len(NUMERIC_TOKEN.findall(s)) / num_tokens > NUMERIC_RATIO_LIMIT:
+            continue
+
+        cleaned.append(s)
+
+    return " ".join(cleaned).strip()
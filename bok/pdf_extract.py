@@ -0,0 +1,151 @@
+import os
+from multiprocessing import Pipe, Process
+
+from pdfminer.high_level import extract_text
+from pdfminer.pdfdocument import PDFDocument, PDFNoOutlines
+from pdfminer.pdfpage import PDFPage
+from pdfminer.pdfparser import PDFParser
+from pdfminer.pdftypes import resolve1
+from pdfminer.psparser import PSLiteral
+
+from normalize import STATISTICS_SECTION
+
+# --------------------------
+# 페이지 병렬 PDF 텍스트 추출
+# --------------------------
+# Lambda 에는 /dev/shm 이 없어 multiprocessing.Pool / Queue 를 쓸 수 없다.
+# 페이지 구간마다 Process 를 띄우고 Pipe 로 결과를 받는다.
+#
+# extract_text 는 페이지마다 텍스트 + "\f" 를 출력하므로
+# 페이지 구간별 결과를 순서대로 이어 붙이면 한 번에 추출한 것과 같다.
+
+# 0 이면 CPU 수만큼 (Lambda 는 메모리에 비례해 vCPU 가 늘어난다)
+PDF_WORKERS = int(os.environ.get("PDF_WORKERS", "0"))
+
+# 이보다 짧은 문서는 프로세스를 띄우지 않는다
+MIN_PAGES_PER_WORKER = 4
+
+# 목차(outline)에서 이 제목부터는 통계 부록 → 추출 생략
+# 본문 정규화(cut_statistics_section)가 자르는 제목과 같은 패턴을 쓴다
+STATISTICS_OUTLINE = STATISTICS_SECTION
+
+
+def worker_count() -> int:
+    return PDF_WORKERS or os.cpu_count() or 1
+
+
+def page_index(doc: PDFDocument) -> dict[int, int]:
+    """페이지 객체 id → 0 부터 시작하는 페이지 번호"""
+    return {page.pageid: i for i, page in enumerate(PDFPage.create_pages(doc))}
+
+
+def outline_page(doc: PDFDocument, dest, action, pages: dict[int, int]) -> int | None:
+    if dest is None and action is not None:
+        action = resolve1(action)
+        if isinstance(action, dict):
+            dest = action.get("D")
+
+    dest = resolve1(dest)
+    if isinstance(dest, (str, bytes, PSLiteral)):
+        name = dest.name if isinstance(dest, PSLiteral) else dest
+        try:
+            dest = resolve1(doc.get_dest(name))
+        except KeyError:
+            return None
+    if isinstance(dest, dict):
+        dest = resolve1(dest.get("D"))
+
+    if isinstance(dest, list) and dest and hasattr(dest[0], "objid"):
+        return pages.get(dest[0].objid)
+    return None
+
+
+def scan_pdf(path: str) -> tuple[int, int | None]:
+    """
+    (전체 페이지 수, 통계 부록 시작 페이지 번호 | None)
+    outline 이 없거나 해석이 안 되면 부록 위치는 None → 전체 추출.
+    """
+    with open(path, "rb") as f:
+        doc = PDFDocument(PDFParser(f))
+        pages = page_index(doc)
+
+        statistics_page = None
+        try:
+            for _, title, dest, action, _ in doc.get_outlines():
+                if title and STATISTICS_OUTLINE.search(str(title)):
+                    statistics_page = outline_page(doc, dest, action, pages)
+                    if statistics_page is not None:
+                        break
+        except PDFNoOutlines:
+            pass
+        except Exception:
+            # outline 이 깨진 문서는 부록 생략 없이 진행
+            statistics_page = None
+
+    return len(pages), statistics_page
+
+
+def split_ranges(num_pages: int, parts: int) -> list[range]:
+    parts = max(1, min(parts, num_pages))
+    size, extra = divmod(num_pages, parts)
+
+    ranges, start = [], 0
+    for i in range(parts):
+        end = start + size + (1 if i < extra else 0)
+        ranges.append(range(start, end))
+        start = end
+    return ranges
+
+
+def extract_pages(conn, path: str, pages: range):
+    try:
+        conn.send(("ok", extract_text(path, page_numbers=list(pages))))
+    except Exception as e:
+        conn.send(("error", repr(e)))
+    finally:
+        conn.close()
+
+
+def extract_parallel(path: str, ranges: list[range]) -> str:
+    jobs = []
+    for pages in ranges:
+        parent, child = Pipe(duplex=False)
+        proc = Process(target=extract_pages, args=(child, path, pages))
+        proc.start()
+        child.close()
+        jobs.append((proc, parent, pages))
+
+    chunks = []
+    try:
+        # 결과를 먼저 받아야 큰 텍스트로 Pipe 가 막히지 않는다
+        for proc, parent, pages in jobs:
+            status, payload = parent.recv()
+            if status != "ok":
+                raise RuntimeError(
+                    f"PDF extraction failed for pages {pages.start}-{pages.stop - 1}: {payload}"
+                )
+            chunks.append(payload)
+    finally:
+        for proc, parent, _ in jobs:
+            parent.close()
+            proc.join()
+
+    return "".join(chunks)
+
+
+def extract_report_text(path: str, skip_statistics: bool = True) -> str:
+    """
+    보고서 PDF → 텍스트.
+
+    통계 부록 페이지는 (outline 으로 찾을 수 있으면) 추출하지 않는다.
+    부록 시작 페이지 자체는 포함하므로 cut_statistics_section 결과는 같다.
+    """
+    num_pages, statistics_page = scan_pdf(path)
+    if skip_statistics and statistics_page is not None:
+        num_pages = statistics_page + 1
+
+    workers = min(worker_count(), num_pages // MIN_PAGES_PER_WORKER)
+    if workers <= 1:
+        return extract_text(path, page_numbers=list(range(num_pages)))
+
+    return extract_parallel(path, split_ranges(num_pages, workers))
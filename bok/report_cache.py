@@ -0,0 +1,186 @@
+import hashlib
+import json
+import os
+
+import boto3
+from botocore.exceptions import ClientError
+
+s3 = boto3.client("s3")
+
+CACHE_BUCKET = os.environ.get("BOK_CACHE_BUCKET") or os.environ["S3_BUCKET_NAME"]
+CACHE_PREFIX = "bok-cache"
+LOCAL_DIR = "/tmp/bok-cache"
+
+PDF_NAME = "report.pdf"
+RAW_TEXT_NAME = "raw.txt"
+
+# 정규화·문단 분리 규칙이 바뀌면 올린다 (기존 문단 캐시 무효화)
+PARAGRAPHS_VERSION = 1
+
+PRECONDITION_ERRORS = {"PreconditionFailed", "ConditionalRequestConflict"}
+
+# --------------------------
+# 저장 구조 (PDF SHA-256 기준)
+# --------------------------
+# bok-cache/{sha}/report.pdf
+# bok-cache/{sha}/raw.txt                         → pdfminer 추출 원문
+# bok-cache/{sha}/paragraphs.{type}.v{N}.json     → 정규화된 문단
+# bok-cache/urls/{sha256(url)}.json               → {"url", "sha256"}
+#
+# 같은 내용이면 같은 키이므로 객체는 한 번 쓰면 바뀌지 않는다.
+# /tmp 를 1차 캐시로 쓰고 없으면 S3 에서 받아 /tmp 에 채운다.
+
+
+def sha256_file(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def object_key(sha: str, name: str) -> str:
+    return f"{CACHE_PREFIX}/{sha}/{name}"
+
+
+def local_path(sha: str, name: str) -> str:
+    return os.path.join(LOCAL_DIR, sha, name)
+
+
+def url_key(url: str) -> str:
+    return f"{CACHE_PREFIX}/urls/{hashlib.sha256(url.encode('utf-8')).hexdigest()}.json"
+
+
+def paragraphs_name(type_: str) -> str:
+    return f"paragraphs.{type_}.v{PARAGRAPHS_VERSION}.json"
+
+
+def write_local(path: str, body: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.part"
+    with open(tmp, "wb") as f:
+        f.write(body)
+    os.replace(tmp, path)
+
+
+def put_object_once(key: str, body, content_type: str):
+    try:
+        s3.put_object(
+            Bucket=CACHE_BUCKET,
+            Key=key,
+            Body=body,
+            ContentType=content_type,
+            IfNoneMatch="*",
+        )
+    except ClientError as e:
+        # 이미 같은 내용이 있음
+        if e.response["Error"]["Code"] not in PRECONDITION_ERRORS:
+            raise
+
+
+def exists(sha: str, name: str) -> bool:
+    if os.path.exists(local_path(sha, name)):
+        return True
+    try:
+        s3.head_object(Bucket=CACHE_BUCKET, Key=object_key(sha, name))
+    except ClientError as e:
+        if e.response["Error"]["Code"] in ("404", "NoSuchKey", "NotFound"):
+            return False
+        raise
+    return True
+
+
+def get_object(key: str) -> bytes | None:
+    try:
+        r = s3.get_object(Bucket=CACHE_BUCKET, Key=key)
+    except ClientError as e:
+        if e.response["Error"]["Code"] == "NoSuchKey":
+            return None
+        raise
+    return r["Body"].read()
+
+
+# --------------------------
+# 조회 / 저장
+# --------------------------
+def get_bytes(sha: str, name: str) -> bytes | None:
+    path = local_path(sha, name)
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            return f.read()
+
+    body = get_object(object_key(sha, name))
+    if body is not None:
+        write_local(path, body)
+    return body
+
+
+def put_bytes(sha: str, name: str, body: bytes, content_type: str):
+    write_local(local_path(sha, name), body)
+    put_object_once(object_key(sha, name), body, content_type)
+
+
+def get_file(sha: str, name: str) -> str | None:
+    """로컬 경로로 돌려준다 (pdfminer 등 파일 경로가 필요한 경우)"""
+    path = local_path(sha, name)
+    if os.path.exists(path) or get_bytes(sha, name) is not None:
+        return path
+    return None
+
+
+def lookup_url(url: str) -> str | None:
+    body = get_object(url_key(url))
+    if body is None:
+        return None
+
+    sha = json.loads(body)["sha256"]
+    # URL 기록만 있고 PDF 가 없으면 다시 받는다 (PDF 는 추출이 필요할 때만 내려받음)
+    return sha if exists(sha, PDF_NAME) else None
+
+
+def store_pdf(url: str, path: str, sha: str | None = None) -> str:
+    """
+    다운로드한 PDF 를 내용 주소 경로로 옮겨 캐시에 넣고 SHA-256 을 돌려준다.
+    (다운로드하며 해시를 계산했으면 sha 로 넘겨 다시 읽지 않는다)
+    """
+    sha = sha or sha256_file(path)
+
+    cached = local_path(sha, PDF_NAME)
+    os.makedirs(os.path.dirname(cached), exist_ok=True)
+    os.replace(path, cached)
+
+    with open(cached, "rb") as f:
+        put_object_once(object_key(sha, PDF_NAME), f, "application/pdf")
+
+    s3.put_object(
+        Bucket=CACHE_BUCKET,
+        Key=url_key(url),
+        Body=json.dumps({"url": url, "sha256": sha}).encode("utf-8"),
+        ContentType="application/json",
+    )
+    return sha
+
+
+def cached_text(sha: str, name: str, build) -> str:
+    body = get_bytes(sha, name)
+    if body is not None:
+        return body.decode("utf-8")
+
+    text = build()
+    put_bytes(sha, name, text.encode("utf-8"), "text/plain; charset=utf-8")
+    return text
+
+
+def cached_json(sha: str, name: str, build):
+    body = get_bytes(sha, name)
+    if body is not None:
+        return json.loads(body)
+
+    value = build()
+    put_bytes(
+        sha,
+        name,
+        json.dumps(value, ensure_ascii=False).encode("utf-8"),
+        "application/json",
+    )
+    return value
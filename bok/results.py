@@ -0,0 +1,140 @@
+import json
+import os
+import tempfile
+from collections.abc import Iterable, Iterator, Mapping
+
+import boto3
+
+import summary_cache
+
+s3 = boto3.client("s3")
+BUCKET_NAME = os.environ["S3_BUCKET_NAME"]
+SPOOL_DIR = "/tmp"
+
+# ---------------------------
+# 요약 응답 파싱 · 병합 · 게시 (배치 / 직접 호출 공용)
+# ---------------------------
+# 응답 행은 배치 출력 JSONL 과 같은 모양이다.
+#   {"custom_id": ..., "response": {"body": <chat.completion>}, "error": ...}
+
+
+def empty_usage() -> dict:
+    return {"requests": 0, "prompt_tokens": 0, "cached_tokens": 0, "completion_tokens": 0}
+
+
+def add_usage(usage: dict, row: dict):
+    body = (row.get("response") or {}).get("body") or {}
+    u = body.get("usage")
+    if not u:
+        return
+
+    usage["requests"] += 1
+    usage["prompt_tokens"] += u.get("prompt_tokens", 0)
+    usage["completion_tokens"] += u.get("completion_tokens", 0)
+    usage["cached_tokens"] += (u.get("prompt_tokens_details") or {}).get("cached_tokens", 0)
+
+
+def collect_usage(jsonl_rows: list[dict]) -> dict:
+    """
+    전체 토큰 사용량과 프롬프트 캐시 적중(cached_tokens) 합계.
+    """
+    usage = empty_usage()
+    for row in jsonl_rows:
+        add_usage(usage, row)
+    return usage
+
+
+def parse_row(row: dict) -> tuple[str, dict]:
+    """응답 행 1개 → (custom_id, 요약 또는 {"id", "error"})"""
+    custom_id = row.get("custom_id")
+    error = row.get("error")
+    response = row.get("response")
+
+    if error:
+        return custom_id, {
+            "id": custom_id,
+            "error": error,
+        }
+
+    try:
+        content = response["body"]["choices"][0]["message"]["content"]
+        return custom_id, json.loads(content)
+    except Exception as e:
+        return custom_id, {
+            "id": custom_id,
+            "error": f"json_parse_error: {e}",
+        }
+
+
+def parse_batch_jsonl(jsonl_rows: list[dict]) -> dict[str, dict]:
+    """
+    custom_id → 요약 (또는 {"id", "error"}).
+    배치 출력 순서는 입력 순서와 같다는 보장이 없어 custom_id 로 묶는다.
+    """
+    return dict(parse_row(row) for row in jsonl_rows)
+
+
+def iter_merged(job: dict, batch_results: Mapping[str, dict], stats: dict) -> Iterator[dict]:
+    """
+    요청 순서대로 응답과 요약 캐시를 합쳐 하나씩 내보낸다.
+    새로 받은 요약은 캐시에 넣는다. 캐시 사용 수는 stats["cached"] 에 센다.
+    """
+    stats.setdefault("cached", 0)
+
+    request_ids = job.get("request_ids")
+    if not request_ids:
+        # 캐시 도입 전 항목
+        for k in sorted(batch_results):
+            yield batch_results[k]
+        return
+
+    cache_keys = job["cache_keys"]
+    cached_ids = set(job.get("cached_ids", []))
+    cached = summary_cache.lookup(
+        [key for rid, key in zip(request_ids, cache_keys) if rid in cached_ids]
+    )
+
+    for rid, key in zip(request_ids, cache_keys):
+        if rid in batch_results:
+            result = batch_results[rid]
+            if "error" not in result:
+                summary_cache.store(key, result)
+        elif key in cached:
+            result = cached[key]
+            stats["cached"] += 1
+        else:
+            result = {"id": rid, "error": "missing_result"}
+        yield result
+
+
+def merge_results(job: dict, batch_results: Mapping[str, dict]) -> tuple[list[dict], int]:
+    """반환: (요청 순서의 결과 목록, 캐시 사용 수)"""
+    stats = {}
+    results = list(iter_merged(job, batch_results, stats))
+    return results, stats["cached"]
+
+
+def save_to_s3(code: str, type_: str, results: Iterable[dict]) -> str:
+    """
+    결과를 하나씩 /tmp 파일에 JSON 배열로 써 나간 뒤 파일째 올린다.
+    (json.dumps(list) 와 같은 바이트)
+    """
+    key = f"monetary-policy/{code}/{type_}.json"
+
+    with tempfile.TemporaryFile(dir=SPOOL_DIR) as f:
+        f.write(b"[")
+        for i, result in enumerate(results):
+            if i:
+                f.write(b", ")
+            f.write(json.dumps(result, ensure_ascii=False).encode("utf-8"))
+        f.write(b"]")
+        f.seek(0)
+
+        s3.put_object(
+            Bucket=BUCKET_NAME,
+            Key=key,
+            Body=f,
+            ContentType="application/json",
+            CacheControl="max-age=3600",
+        )
+    return key
@@ -0,0 +1,79 @@
+import os
+from datetime import datetime, timezone
+
+import boto3
+from botocore.exceptions import ClientError
+
+import watch
+
+scheduler = boto3.client("scheduler")
+
+SCHEDULE_NAME = os.environ.get("BOK_WATCH_SCHEDULE_NAME", "bok-batch-watch")
+# EventBridge Scheduler 가 Lambda 를 호출할 때 쓰는 역할
+WATCH_ROLE_ARN = os.environ.get("BOK_WATCH_ROLE_ARN")
+# 배치를 제출하는 함수에서 깨울 대상 (배치 결과 처리 함수)
+WATCH_TARGET_ARN = os.environ.get("BOK_WATCH_TARGET_ARN")
+WATCH_EVENT = '{"watch": true}'
+
+
+# --------------------------
+# 배치 결과 확인 예약 (1회 실행 스케줄, 실행 후 자동 삭제)
+# --------------------------
+# 스케줄마다 실행 시각을 붙인 새 이름을 쓴다 (bok-batch-watch-20261019T070530).
+# 이름 하나를 고쳐 쓰면 지금 실행 중인 스케줄의 자동 삭제와 다음 예약이 겹쳐
+# 다음 확인이 사라질 수 있다. 이미 더 이른 확인이 잡혀 있으면 그대로 두고,
+# 더 늦은 예약은 지운다. 예약에 실패해도 작업 자체는 실패시키지 않는다
+# (매일 한 번 도는 cron 이 받쳐 준다).
+
+
+def pending_checks(now: datetime) -> dict[str, datetime]:
+    """아직 실행되지 않은 확인 예약 {이름: 실행 시각}"""
+    pending = {}
+    for page in scheduler.get_paginator("list_schedules").paginate(NamePrefix=f"{SCHEDULE_NAME}-"):
+        for item in page["Schedules"]:
+            when = watch.parse_schedule_name(SCHEDULE_NAME, item["Name"])
+            if when is not None and when > now:
+                pending[item["Name"]] = when
+    return pending
+
+
+def schedule_check(delay: int, target_arn: str | None = None, now: datetime | None = None) -> dict:
+    """delay 초 뒤 대상 함수를 {"watch": true} 이벤트로 한 번 실행한다."""
+    target_arn = target_arn or WATCH_TARGET_ARN
+    if not target_arn or not WATCH_ROLE_ARN:
+        return {"status": "DISABLED"}
+
+    now = now or datetime.now(timezone.utc)
+    wanted = watch.check_time(now, delay)
+
+    try:
+        pending = pending_checks(now)
+        earliest = min(pending.values(), default=None)
+        if watch.keep_existing(earliest, wanted, now):
+            return {"status": "KEPT", "at": earliest.isoformat()}
+
+        name = watch.schedule_name(SCHEDULE_NAME, wanted)
+        try:
+            scheduler.create_schedule(
+                Name=name,
+                ScheduleExpression=watch.at_expression(wanted),
+                ScheduleExpressionTimezone="UTC",
+                FlexibleTimeWindow={"Mode": "OFF"},
+                Target={"Arn": target_arn, "RoleArn": WATCH_ROLE_ARN, "Input": WATCH_EVENT},
+                ActionAfterCompletion="DELETE",
+            )
+        except scheduler.exceptions.ConflictException:
+            # 같은 초에 다른 실행이 같은 확인을 먼저 예약함
+            pass
+
+        # 새 예약보다 늦은 확인은 필요 없다
+        for later in (n for n, when in pending.items() if when > wanted):
+            try:
+                scheduler.delete_schedule(Name=later)
+            except scheduler.exceptions.ResourceNotFoundException:
+                pass
+
+    except ClientError as e:
+        return {"status": "ERROR", "error": str(e)}
+
+    return {"status": "SCHEDULED", "at": wanted.isoformat(), "name": name}
@@ -0,0 +1,56 @@
+import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import report_cache
+
+SUMMARY_PREFIX = f"{report_cache.CACHE_PREFIX}/summaries"
+FETCH_WORKERS = 8
+
+# --------------------------
+# 문단 요약 캐시
+# --------------------------
+# bok-cache/summaries/{sha256(request body)}.json → 파싱된 요약 {title, summary, tooltip}
+#
+# 키는 요청 본문 전체(모델 · 프롬프트 · 응답 스키마 · 문단)의 해시이므로
+# 프롬프트나 모델이 바뀌면 자연히 새 키가 된다.
+
+
+def request_key(body: dict) -> str:
+    raw = json.dumps(body, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def summary_key(key: str) -> str:
+    return f"{SUMMARY_PREFIX}/{key}.json"
+
+
+def lookup(keys: list[str]) -> dict[str, dict]:
+    """캐시에 있는 요약만 {key: result} 로 돌려준다."""
+    keys = list(dict.fromkeys(keys))
+    if not keys:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=min(FETCH_WORKERS, len(keys))) as pool:
+        bodies = pool.map(lambda k: report_cache.get_object(summary_key(k)), keys)
+        return {k: json.loads(b) for k, b in zip(keys, bodies) if b is not None}
+
+
+def store(key: str, result: dict):
+    report_cache.put_object_once(
+        summary_key(key),
+        json.dumps(result, ensure_ascii=False).encode("utf-8"),
+        "application/json",
+    )
+
+
+def split_cached(requests: list[tuple[str, dict]]) -> tuple[list, list[str], list[str]]:
+    """
+    [(custom_id, body)] → (캐시에 없는 요청, 요청별 캐시 키, 캐시로 대신한 custom_id)
+    """
+    keys = [request_key(body) for _, body in requests]
+    cached = lookup(keys)
+
+    pending = [(cid, body) for (cid, body), key in zip(requests, keys) if key not in cached]
+    cached_ids = [cid for (cid, _), key in zip(requests, keys) if key in cached]
+    return pending, keys, cached_ids
@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta, timezone
+
+# --------------------------
+# 배치 완료 감시 일정 (순수 함수 — AWS 호출 없음)
+# --------------------------
+# 배치 생성 시각(created_at)에서 MIN, 2·MIN, 4·MIN, ... 지난 시점마다 확인한다.
+# 간격은 MAX 에서 멈추고, 마무리 단계(finalizing)는 곧 끝나므로 MIN 뒤에 다시 본다.
+# 상태를 따로 저장하지 않아도 created_at 과 현재 시각만으로 다음 확인 시점이 정해진다.
+
+MIN_DELAY_SECONDS = 60
+MAX_DELAY_SECONDS = 3600
+
+# 아직 결과가 없는 배치 상태 (나머지는 이번 실행에서 처리된다)
+RUNNING_STATUSES = {"validating", "in_progress", "finalizing", "cancelling"}
+FINALIZING_STATUSES = {"finalizing"}
+
+# 완료 창(24h)이 지나면 expired 가 되어야 하지만, 그래도 진행 중으로 남은 배치는
+# 이 시간이 지나면 포기한다 (취소 후 error → 감시 종료)
+MAX_RUNNING_SECONDS = 30 * 3600
+
+
+def next_check_delay(status: str, created_at: float, now: float) -> int | None:
+    """배치 1건의 다음 확인까지 초. 진행 중이 아니면 None."""
+    if status not in RUNNING_STATUSES:
+        return None
+    if status in FINALIZING_STATUSES:
+        return MIN_DELAY_SECONDS
+
+    age = max(0.0, now - created_at)
+
+    # created_at + MIN·2^k 중 지금 이후 첫 시점
+    step = MIN_DELAY_SECONDS
+    while step <= age:
+        step *= 2
+    delay = created_at + step - now
+
+    return int(min(max(delay, MIN_DELAY_SECONDS), MAX_DELAY_SECONDS))
+
+
+def overdue(created_at: float | None, now: float) -> bool:
+    return created_at is not None and now - created_at > MAX_RUNNING_SECONDS
+
+
+def plan_next_check(batches: list[dict], now: float) -> int | None:
+    """
+    [{"status", "created_at"}] → 가장 이른 다음 확인까지 초.
+    진행 중인 배치가 없으면 None (감시 종료).
+    """
+    delays = [
+        next_check_delay(b["status"], b["created_at"], now)
+        for b in batches
+        if b.get("created_at") is not None
+    ]
+    delays = [d for d in delays if d is not None]
+    return min(delays) if delays else None
+
+
+def at_expression(when: datetime) -> str:
+    """EventBridge Scheduler 1회 실행 식 (UTC, 초 단위)"""
+    return f"at({when.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S')})"
+
+
+def schedule_name(prefix: str, when: datetime) -> str:
+    """1회 실행 스케줄 이름 (실행 시각마다 다른 이름 → 실행 후 자동 삭제와 겹치지 않는다)"""
+    return f"{prefix}-{when.astimezone(timezone.utc).strftime('%Y%m%dT%H%M%S')}"
+
+
+def parse_schedule_name(prefix: str, name: str) -> datetime | None:
+    if not name.startswith(f"{prefix}-"):
+        return None
+    try:
+        when = datetime.strptime(name[len(prefix) + 1:], "%Y%m%dT%H%M%S")
+    except ValueError:
+        return None
+    return when.replace(tzinfo=timezone.utc)
+
+
+def check_time(now: datetime, delay: int) -> datetime:
+    return (now + timedelta(seconds=delay)).replace(microsecond=0)
+
+
+def keep_existing(existing: datetime | None, wanted: datetime, now: datetime) -> bool:
+    """이미 잡힌 확인이 아직 오지 않았고 더 이르면 그대로 둔다."""
+    return existing is not None and now < existing <= wanted
@@ -1,38 +1,140 @@
 from common.slack import send_slack_message
+from common.resample import from_yyyymmdd, resample
+from common.store import publish_series
 import requests
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta, timezone
+import bisect
 import boto3
 from botocore.exceptions import ClientError
-import calendar
-import hashlib
+from concurrent.futures import ThreadPoolExecutor
 import json
+import numpy as np
 import os
 import time
 
 s3 = boto3.client("s3")
 
 BUCKET_NAME = os.environ["S3_BUCKET_NAME"]
-OUTPUT_KEY = os.environ["S3_OUTPUT_KEY"]
 KRX_API_KEY = os.environ["KRX_API_KEY"]
-INDEX_TYPE = os.environ["INDEX_TYPE"]
 
+# 시장(API) → {IDX_NM: 출력 키}
+# 예) {"kospi_dd_trd": {"코스피": "data/kospi.json", "코스피 200": "data/kospi-200.json"}}
+# KRX_SERIES 가 없으면 기존 단일 지수 설정(INDEX_TYPE + S3_OUTPUT_KEY)을 사용
+OUTPUT_KEY = os.environ.get("S3_OUTPUT_KEY")
+INDEX_TYPE = os.environ.get("INDEX_TYPE")
+MARKET_INDEX_NAMES = {"kospi_dd_trd": "코스피", "kosdaq_dd_trd": "코스닥"}
+SERIES = json.loads(os.environ.get("KRX_SERIES") or "null") or {
+    INDEX_TYPE: {MARKET_INDEX_NAMES.get(INDEX_TYPE, "코스피"): OUTPUT_KEY},
+}
+
+# 거래일 캘린더 캐시 (KOSPI/KOSDAQ 함수가 공유)
+CALENDAR_KEY = os.environ.get("KRX_CALENDAR_KEY", "meta/krx-trading-calendar.json")
+# 추가로 알고 있는 휴장일 (YYYYMMDD, 콤마 구분)
+EXTRA_HOLIDAYS = {d.strip() for d in os.environ.get("KRX_HOLIDAYS", "").split(",") if d.strip()}
+
+# 일별 종가 저장소 (지수별 1개)
+DAILY_PREFIX = os.environ.get("KRX_DAILY_PREFIX", "daily/krx")
+# 한 번 실행에서 채우는 최대 일수 (더 긴 공백은 백필로)
+MAX_DAYS_PER_RUN = 45
+
+# 백필 시 동시에 처리할 월 수
+BACKFILL_WORKERS = int(os.environ.get("KRX_BACKFILL_WORKERS", "4"))
+# 백필 1회에 조회하는 최대 거래일 수 (Timeout 120초 안에 끝나도록, 남은 달은 다음 호출로)
+MAX_BACKFILL_DAYS = int(os.environ.get("KRX_MAX_BACKFILL_DAYS", "100"))
+
+# 월별 집계 → 출력 키 접미사 ("" 은 기존 월말 시계열 그대로)
+ROLLUPS = {"last": "", "mean": ".avg", "high": ".high", "low": ".low"}
+# 월별 집계 → resample 집계 방식
+ROLLUP_AGGREGATIONS = {"last": "last", "mean": "mean", "high": "max", "low": "min"}
+
+KST = timezone(timedelta(hours=9))
 RETRYABLE_STATUS = {401, 403, 429}
 
 
-def get_kospi_close_price(date_str: str) -> float | None:
+# -----------------------------
+# 거래일 캘린더 캐시
+# -----------------------------
+# {
+#   "holidays": ["20240506", ...],   ← 뒤 거래일로 확인된 빈 응답 + 수동 입력
+#   "updated_at": "..."
+# }
+def load_trading_calendar() -> dict:
+    try:
+        r = s3.get_object(Bucket=BUCKET_NAME, Key=CALENDAR_KEY)
+        cal = json.loads(r["Body"].read())
+    except ClientError as e:
+        if e.response["Error"]["Code"] != "NoSuchKey":
+            raise
+        cal = {}
+
+    return {
+        "holidays": set(cal.get("holidays", [])) | EXTRA_HOLIDAYS,
+    }
+
+
+def confirm_holidays(days, trading_calendar: dict, learned: dict):
+    """
+    빈 응답(200 + 빈 OutBlock_1) 날짜는 그 뒤 거래일 데이터가 나온 뒤에만 휴장일로 기록한다.
+    아직 게시 전이거나 일시적으로 비어 온 날이 캘린더에 영구히 남지 않도록.
+    """
+    learned["holidays"].update(days)
+    trading_calendar["holidays"].update(days)
+
+
+def save_trading_calendar(learned: dict):
+    """
+    이번 실행에서 새로 알게 된 휴장일만 기존 캐시에 합쳐 저장한다.
+    (동시에 도는 다른 함수가 먼저 썼으면 다시 읽어서 합침)
+    """
+    for attempt in range(1, 4):
+        try:
+            r = s3.get_object(Bucket=BUCKET_NAME, Key=CALENDAR_KEY)
+            cal, condition = json.loads(r["Body"].read()), {"IfMatch": r["ETag"]}
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "NoSuchKey":
+                raise
+            cal, condition = {}, {"IfNoneMatch": "*"}
+
+        payload = {
+            "holidays": sorted(set(cal.get("holidays", [])) | learned["holidays"]),
+            "updated_at": datetime.utcnow().isoformat(),
+        }
+
+        try:
+            s3.put_object(
+                Bucket=BUCKET_NAME,
+                Key=CALENDAR_KEY,
+                Body=json.dumps(payload, ensure_ascii=False).encode("utf-8"),
+                ContentType="application/json",
+                **condition,
+            )
+            return
+        except ClientError as e:
+            if attempt == 3 or e.response["Error"]["Code"] not in (
+                "PreconditionFailed", "ConditionalRequestConflict"
+            ):
+                raise
+
+
+# -----------------------------
+# KRX API
+# -----------------------------
+def fetch_index_rows(index_type: str, date_str: str) -> list | None:
+    """
+    해당 시장·일자의 OutBlock_1 전체 (지수별 1행).
+    200 + 빈 목록 → 휴장일 또는 아직 게시 전 / None → 조회 실패
+    """
     headers = {"AUTH_KEY": KRX_API_KEY}
-    url = f"http://data-dbg.krx.co.kr/svc/apis/idx/{INDEX_TYPE}"
+    url = f"http://data-dbg.krx.co.kr/svc/apis/idx/{index_type}"
     params = {"basDd": date_str}
 
     for attempt in range(1, 4):
         try:
             r = requests.get(url, headers=headers, params=params, timeout=10)
             if r.status_code == 200:
-                for item in r.json().get("OutBlock_1", []):
-                    if item.get("IDX_NM") in ("코스피", "코스닥"):
-                        return float(item["CLSPRC_IDX"].replace(",", ""))
+                return r.json().get("OutBlock_1", [])
 
-            elif r.status_code not in RETRYABLE_STATUS:
+            if r.status_code not in RETRYABLE_STATUS:
                 return None
 
         except requests.exceptions.RequestException:
@@ -44,131 +146,425 @@ def get_kospi_close_price(date_str: str) -> float | None:
     return None
 
 
-def get_last_trading_day_of_month(year: int, month: int):
-    date = datetime(year, month, calendar.monthrange(year, month)[1])
+def extract_close_prices(rows: list, index_names) -> dict[str, float]:
+    """응답 한 번에서 설정된 IDX_NM 들의 종가를 모두 뽑는다."""
+    prices = {}
+    for item in rows:
+        name = item.get("IDX_NM")
+        if name in index_names and item.get("CLSPRC_IDX") not in (None, "", "-"):
+            prices[name] = float(item["CLSPRC_IDX"].replace(",", ""))
+    return prices
 
-    while date.month == month:
-        if date.weekday() < 5:
-            price = get_kospi_close_price(date.strftime("%Y%m%d"))
-            if price is not None:
-                return date.strftime("%Y-%m"), price
-        date -= timedelta(days=1)
 
-    return None
+# -----------------------------
+# 일별 종가 저장소
+# -----------------------------
+# daily/krx/kospi.json
+# {"since": 20240401, "dates": [20240401, 20240402, ...], "close": [2747.86, 2753.16, ...]}
+#
+# since 이후로는 거래일이 빠짐없이 들어 있다 (월 집계는 since 가 속한 달부터).
+def daily_key(output_key: str) -> str:
+    name = output_key.rsplit("/", 1)[-1]
+    return f"{DAILY_PREFIX}/{name}"
+
+
+def rollup_key(output_key: str, suffix: str) -> str:
+    stem = output_key[:-len(".json")] if output_key.endswith(".json") else output_key
+    return f"{stem}{suffix}.json"
 
 
-def load_existing_data() -> list:
+def load_daily(key: str) -> tuple[dict | None, str | None]:
     try:
-        r = s3.get_object(Bucket=BUCKET_NAME, Key=OUTPUT_KEY)
-        return json.loads(r["Body"].read())
+        r = s3.get_object(Bucket=BUCKET_NAME, Key=key)
     except ClientError as e:
+        if e.response["Error"]["Code"] == "NoSuchKey":
+            return None, None
         raise
+    return json.loads(r["Body"].read()), r["ETag"]
 
 
-def upload_json(data: list):
+def save_daily(key: str, daily: dict, etag: str | None):
+    condition = {"IfMatch": etag} if etag else {"IfNoneMatch": "*"}
     s3.put_object(
         Bucket=BUCKET_NAME,
-        Key=OUTPUT_KEY,
-        Body=json.dumps(data, ensure_ascii=False).encode("utf-8"),
+        Key=key,
+        Body=json.dumps(daily, separators=(",", ":")).encode("utf-8"),
         ContentType="application/json",
-        CacheControl="max-age=3600",
+        **condition,
     )
 
 
-def move_to_prev_month(now: datetime) -> datetime:
-    month = 12 if now.month == 1 else now.month - 1
-    year = now.year - 1 if now.month == 1 else now.year
-    return datetime(year, month, 1)
+def append_daily(daily: dict, day: int, close: float):
+    """날짜순 유지. 이미 있는 날짜면 값만 교체."""
+    dates = daily["dates"]
+    if not dates or day > dates[-1]:
+        dates.append(day)
+        daily["close"].append(close)
+        return
+
+    i = bisect.bisect_left(dates, day)
+    if i < len(dates) and dates[i] == day:
+        daily["close"][i] = close
+    else:
+        dates.insert(i, day)
+        daily["close"].insert(i, close)
+
+
+def candidate_days(start: date, end: date, holidays: set) -> list[str]:
+    days = []
+    cur = start
+    while cur <= end:
+        day = cur.strftime("%Y%m%d")
+        if cur.weekday() < 5 and day not in holidays:
+            days.append(day)
+        cur += timedelta(days=1)
+    return days
+
+
+def collect_daily(
+    index_type: str,
+    series: dict,
+    stores: dict,
+    start: date,
+    end: date,
+    trading_calendar: dict,
+    learned: dict,
+) -> tuple[list[int], int | None]:
+    """
+    start~end 거래일마다 시장당 1회 조회해 설정된 모든 지수에 추가.
+    조회 실패가 나면 거기서 멈춘다 (저장소에 구멍이 생기지 않도록).
+    빈 응답은 뒤에 거래일이 나와야 휴장일로 확정하고, 끝까지 확정되지 않으면
+    그 날에서 멈춘 것으로 본다 (다음 실행이 다시 조회).
+    반환: (추가된 날짜, 처리하지 못한 첫 후보일 — 끝까지 처리했으면 None)
+    """
+    appended = []
+    unconfirmed = []
+    days = candidate_days(start, end, trading_calendar["holidays"])
+
+    for i, day in enumerate(days):
+        if i == MAX_DAYS_PER_RUN:
+            return appended, int((unconfirmed or [day])[0])
+
+        rows = fetch_index_rows(index_type, day)
 
+        if rows is None:
+            return appended, int((unconfirmed or [day])[0])
+        if rows == []:
+            unconfirmed.append(day)
+            continue
 
-def hash_list(data: list) -> str:
+        confirm_holidays(unconfirmed, trading_calendar, learned)
+        unconfirmed = []
+
+        prices = extract_close_prices(rows, series)
+        for name, key in series.items():
+            if name in prices:
+                append_daily(stores[key]["daily"], int(day), prices[name])
+        appended.append(int(day))
+
+    return appended, int(unconfirmed[0]) if unconfirmed else None
+
+
+def month_start(day: int) -> int:
+    return day // 100 * 100 + 1
+
+
+def month_complete(dates: set, first: date, holidays: set) -> bool:
+    """first 가 속한 달의 거래일이 저장소에 모두 있는지"""
+    last = (first.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+    days = candidate_days(first, last, holidays)
+    return bool(days) and all(int(d) in dates for d in days)
+
+
+# -----------------------------
+# 월별 집계 (일별 → 월말 / 평균 / 고가 / 저가)
+# -----------------------------
+def monthly_rollups(daily: dict, until: int, months=()) -> dict[str, list]:
     """
-    리스트 전체를 안정적으로 해시하기 위해
-    key 정렬 + UTF-8 인코딩 후 SHA256 적용
+    since ≤ 날짜 < until 구간을 월 단위로 묶어 집계한다.
+    (until 은 보통 이번 달 1일 → 끝난 달만 집계)
+    months(YYYYMM) 는 since 이전이지만 거래일이 모두 모인 달 (백필) → 같이 집계.
     """
-    raw = json.dumps(data, sort_keys=True, separators=(",", ":")).encode("utf-8")
-    return hashlib.sha256(raw).hexdigest()
+    dates = np.asarray(daily["dates"], dtype=np.int64)
+    close = np.asarray(daily["close"], dtype=float)
+
+    since_month = daily.get("since", 0) // 100
+    mask = (dates // 100 >= since_month) | np.isin(dates // 100, list(months))
+    dates, close = dates[mask], close[mask]
+
+    until_month = f"{until // 10000}-{until // 100 % 100:02d}"
+    rolled = resample(
+        from_yyyymmdd(dates),
+        close,
+        list(ROLLUP_AGGREGATIONS.values()),
+        freq="M",
+        until=until_month,
+        decimals=2,
+    )
+    return {name: rolled[how] for name, how in ROLLUP_AGGREGATIONS.items()}
+
+
+def publish_rollups(output_key: str, daily: dict, until: int, months=()) -> list[dict]:
+    rollups = monthly_rollups(daily, until, months)
+
+    results = []
+    for name, suffix in ROLLUPS.items():
+        key = rollup_key(output_key, suffix)
+        try:
+            # 집계 범위 밖(저장소 이전)의 월은 그대로 유지 → upsert
+            result = publish_series(BUCKET_NAME, key, rollups[name])
+        except Exception as e:
+            result = {"status": "ERROR", "error": str(e)}
+        results.append({"key": key, "rollup": name, **result})
+    return results
+
+
+def load_stores(series: dict, since: date) -> dict:
+    stores = {}
+    for key in series.values():
+        daily, etag = load_daily(daily_key(key))
+        if daily is None:
+            daily = {"since": int(since.strftime("%Y%m%d")), "dates": [], "close": []}
+        stores[key] = {"daily": daily, "etag": etag}
+    return stores
+
+
+def summarize(results: list[dict]) -> dict:
+    total = len(results)
+    failed = sum(1 for r in results if r["status"] == "ERROR")
+
+    if failed == 0:
+        status = "SUCCESS"
+    elif failed < total:
+        status = "PARTIAL_FAILURE"
+    else:
+        status = "FAILURE"
+
+    return {
+        "status": status,
+        "total": total,
+        "failed": failed,
+        "results": results,
+    }
 
 
 def run():
-    existing = load_existing_data()
-    if not isinstance(existing, list):
-        raise RuntimeError("Existing data is not a list")
+    trading_calendar = load_trading_calendar()
+    learned = {"holidays": set()}
 
-    prev_month = move_to_prev_month(datetime.utcnow())
-    result = get_last_trading_day_of_month(prev_month.year, prev_month.month)
+    today = datetime.now(KST).date()
+    yesterday = today - timedelta(days=1)
+    this_month = int(today.replace(day=1).strftime("%Y%m%d"))
+    # 새 저장소는 지난달 1일부터 채운다 (지난달 집계가 바로 가능하도록)
+    prev_month_start = (today.replace(day=1) - timedelta(days=1)).replace(day=1)
 
-    if not result:
-        return {
-            "status": "NO_DATA",
-            "ym": None,
-            "price": None,
-        }
+    results = []
+
+    for index_type, series in SERIES.items():
+        stores = load_stores(series, prev_month_start)
+
+        # 시장 내 지수 중 가장 뒤처진 날짜 다음날부터
+        last_days = [s["daily"]["dates"][-1] for s in stores.values() if s["daily"]["dates"]]
+        if len(last_days) == len(stores):
+            start = datetime.strptime(str(min(last_days)), "%Y%m%d").date() + timedelta(days=1)
+        else:
+            start = prev_month_start
+
+        appended, stopped_at = collect_daily(
+            index_type, series, stores, start, yesterday, trading_calendar, learned
+        )
+
+        # 중간에 멈췄으면 그 날이 속한 달부터는 아직 덜 모인 달
+        until = this_month if stopped_at is None else min(this_month, month_start(stopped_at))
+
+        for key, store in stores.items():
+            if appended:
+                save_daily(daily_key(key), store["daily"], store["etag"])
+
+            # 마지막 후보일까지 모인 달에 새 거래일이 들어왔을 때만 월 집계를 다시 게시
+            if any(d < until for d in appended):
+                results += publish_rollups(key, store["daily"], until)
+            else:
+                results.append({"key": key, "status": "NO_CHANGE", "appended": len(appended)})
+
+    if learned["holidays"]:
+        save_trading_calendar(learned)
+
+    return summarize(results)
 
-    ym, price = result
 
-    # -----------------------------
-    # 1️⃣ 새 리스트 생성
-    # -----------------------------
-    new_list = list(existing)
+# -----------------------------
+# 백필: 기간 내 빠진 거래일을 월 단위로 병렬 조회
+# -----------------------------
+def fetch_days(index_type: str, days: list[str]) -> dict[str, list | None]:
+    return {day: fetch_index_rows(index_type, day) for day in days}
 
-    found = False
-    for item in new_list:
-        if item["x"] == ym:
-            item["y"] = price
-            found = True
+
+def next_month_start(day: int) -> int:
+    year, month = day // 10000, day // 100 % 100
+    return (year + month // 12) * 10000 + (month % 12 + 1) * 100 + 1
+
+
+def month_firsts(start: date, end: date) -> list[date]:
+    firsts, cur = [], start.replace(day=1)
+    while cur <= end:
+        firsts.append(cur)
+        cur = (cur.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return firsts
+
+
+def take_months(by_month: dict[str, list[str]], limit: int) -> dict[str, list[str]]:
+    """앞 달부터 limit 거래일 이내로 자른다 (달은 나누지 않고, 첫 달은 항상 포함)."""
+    taken, total = {}, 0
+    for month, days in by_month.items():
+        if taken and total + len(days) > limit:
             break
+        taken[month] = days
+        total += len(days)
+    return taken
 
-    if not found:
-        new_list.append({"x": ym, "y": price})
 
-    new_list.sort(key=lambda x: x["x"])
+def drop_new_days_after(daily: dict, day: int, original: set):
+    """이번 실행에서 추가한 날짜 중 day 이후 것을 버린다."""
+    kept = [
+        (d, c) for d, c in zip(daily["dates"], daily["close"])
+        if d <= day or d in original
+    ]
+    daily["dates"] = [d for d, _ in kept]
+    daily["close"] = [c for _, c in kept]
 
-    # -----------------------------
-    # 2️⃣ 개수 감소 방지
-    # -----------------------------
-    old_count = len(existing)
-    new_count = len(new_list)
 
-    if new_count < old_count:
-        return {
-            "status": "SKIPPED_SHRINK",
-            "old_count": old_count,
-            "new_count": new_count,
-        }
+def run_backfill(start_ym: str, end_ym: str):
+    """
+    start_ym ~ end_ym (YYYY-MM) 중 저장소에 없는 거래일을 채우고
+    지수별로 일별 저장소 저장 1회 + 월 집계 게시 1회만 한다.
+    저장소 since 구간과 이어지지 않아도 거래일이 모두 모인 달은 집계한다.
+    한 번에 MAX_BACKFILL_DAYS 거래일까지만 조회하고, 남은 범위는 next_start 로 알려 준다.
+    조회에 실패한 날이 있는 달은 집계하지 않고 ERROR 로 보고한다.
+    """
+    trading_calendar = load_trading_calendar()
+    learned = {"holidays": set()}
 
-    # -----------------------------
-    # 3️⃣ 해시 비교
-    # -----------------------------
-    old_hash = hash_list(existing)
-    new_hash = hash_list(new_list)
+    today = datetime.now(KST).date()
+    this_month = int(today.replace(day=1).strftime("%Y%m%d"))
 
-    if old_hash == new_hash:
-        return {
-            "status": "NO_CHANGE",
-            "count": old_count,
-            "hash": old_hash,
-        }
+    start = datetime.strptime(start_ym, "%Y-%m").date()
+    end_month = datetime.strptime(end_ym, "%Y-%m").date()
+    end = min(
+        (end_month.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1),
+        today - timedelta(days=1),
+    )
+
+    results = []
+    next_start = None
+
+    for index_type, series in SERIES.items():
+        stores = load_stores(series, start)
+        original = {key: set(s["daily"]["dates"]) for key, s in stores.items()}
+
+        have = set.intersection(*original.values())
+        by_month: dict[str, list[str]] = {}
+        for day in candidate_days(start, end, trading_calendar["holidays"]):
+            if int(day) not in have:
+                by_month.setdefault(day[:6], []).append(day)
+
+        months = take_months(by_month, MAX_BACKFILL_DAYS)
+        remaining = [m for m in by_month if m not in months]
+        if remaining:
+            month = f"{remaining[0][:4]}-{remaining[0][4:]}"
+            next_start = min(next_start or month, month)
+
+        with ThreadPoolExecutor(max_workers=BACKFILL_WORKERS) as pool:
+            fetched = list(pool.map(lambda days: fetch_days(index_type, days), months.values()))
+
+        # 빈 응답은 그보다 뒤 거래일이 있어야 휴장일 (아니면 조회 실패처럼 다음 백필에서 다시)
+        last_traded = max(
+            [int(day) for days in fetched for day, rows in days.items() if rows]
+            + [max(dates) for dates in original.values() if dates],
+            default=0,
+        )
 
-    # -----------------------------
-    # 4️⃣ 변경 발생 시 업로드
-    # -----------------------------
-    upload_json(new_list)
+        failed: list[int] = []
+        for days in fetched:
+            for day, rows in days.items():
+                if rows is None or (rows == [] and int(day) > last_traded):
+                    failed.append(int(day))
+                elif rows == []:
+                    confirm_holidays([day], trading_calendar, learned)
+                else:
+                    prices = extract_close_prices(rows, series)
+                    for name, key in series.items():
+                        if name in prices:
+                            append_daily(stores[key]["daily"], int(day), prices[name])
+
+        for month in sorted({d // 100 for d in failed}):
+            results.append({
+                "key": index_type,
+                "month": f"{month // 100}-{month % 100:02d}",
+                "status": "ERROR",
+                "error": f"fetch failed or not yet published on {sum(d // 100 == month for d in failed)} day(s)",
+            })
+
+        for key, store in stores.items():
+            daily = store["daily"]
+            since = daily["since"]
+            until = this_month
+
+            if failed and not original[key]:
+                # 새 저장소: 마지막 구멍 다음 달부터 집계 (구멍은 다음 백필에서 다시 조회)
+                daily["since"] = max(since, next_month_start(max(failed)))
+            elif any(d >= since for d in failed):
+                # 기존 구간 뒤 구멍: 그 뒤로 붙인 날짜는 버리고 구멍이 있는 달부터는 집계하지 않는다
+                # (정기 실행이 마지막 날짜 다음날, 즉 구멍부터 다시 채운다)
+                hole = min(d for d in failed if d >= since)
+                drop_new_days_after(daily, hole, original[key])
+                until = month_start(hole)
+
+            # since 바로 앞 달부터 거꾸로, 빠짐없이 채워진 달까지 집계 시작점을 앞당긴다
+            # (범위를 나눠 백필해도 이어진 구간 전체가 집계된다)
+            dates = set(daily["dates"])
+            holidays = trading_calendar["holidays"]
+            since_date = datetime.strptime(str(daily["since"]), "%Y%m%d").date()
+            while True:
+                prev = (since_date - timedelta(days=1)).replace(day=1)
+                if not month_complete(dates, prev, holidays):
+                    break
+                since_date = prev
+            daily["since"] = int(since_date.strftime("%Y%m%d"))
+
+            # since 구간과 이어지지 않는 과거 구간도 요청 범위에서 다 모인 달은 따로 집계한다
+            # (월 집계는 upsert 라 기존 월은 그대로)
+            covered = [
+                int(first.strftime("%Y%m"))
+                for first in month_firsts(start, end)
+                if int(first.strftime("%Y%m%d")) < min(daily["since"], until)
+                and month_complete(dates, first, holidays)
+            ]
+
+            save_daily(daily_key(key), daily, store["etag"])
+            if daily["since"] < until or covered:
+                results += publish_rollups(key, daily, until, covered)
+
+    if learned["holidays"]:
+        save_trading_calendar(learned)
+
+    result = summarize(results)
+    if next_start:
+        result["next_start"] = next_start
+    return result
 
-    return {
-        "status": "SUCCESS",
-        "old_count": old_count,
-        "new_count": new_count,
-        "old_hash": old_hash,
-        "new_hash": new_hash,
-    }
 
 def lambda_handler(event, context):
+    backfill = (event or {}).get("backfill")
+
     try:
-        result = run()
+        if backfill:
+            result = run_backfill(backfill["start"], backfill["end"])
+        else:
+            result = run()
 
         send_slack_message(
-            service=f"KRX | {OUTPUT_KEY}",
+            service=f"KRX | {OUTPUT_KEY or 'multi-index'}",
             result=result,
         )
 
@@ -179,7 +575,7 @@ def lambda_handler(event, context):
 
     except Exception as e:
         send_slack_message(
-            service=f"KRX | {OUTPUT_KEY}",
+            service=f"KRX | {OUTPUT_KEY or 'multi-index'}",
             message=str(e),
             status="ERROR",
         )
@@ -0,0 +1,107 @@
+import json
+import random
+import time
+from datetime import datetime
+
+import boto3
+from botocore.exceptions import ClientError
+
+s3 = boto3.client("s3")
+
+CATALOG_KEY = "data/index.json"
+WRITE_ATTEMPTS = 6
+# 충돌 시 재시도 전 대기 (지수 백오프 + 지터). 같은 분에 도는 ECOS 함수들의
+# 제한 시간(10초) 안에 끝나도록 짧게 잡는다: 최대 0.1 + 0.2 + 0.4 + 0.8 + 1.0 초
+BACKOFF_BASE_SECONDS = 0.1
+BACKOFF_CAP_SECONDS = 1.0
+
+PRECONDITION_ERRORS = {"PreconditionFailed", "ConditionalRequestConflict"}
+
+
+class CatalogConflict(Exception):
+    """재시도해도 다른 수집기와 계속 충돌 (다음 실행에서 다시 쓴다)"""
+
+# -----------------------------
+# 카탈로그 구조
+# -----------------------------
+# {
+#   "updated_at": "...",
+#   "series": {
+#     "data/cpi-korea.json": {
+#       "key": "data/cpi-korea.json", "cycle": "M", "last_period": "2024-05",
+#       "count": 341, "hash": "...", "updated_at": "..."
+#     }
+#   }
+# }
+
+
+def load_catalog(bucket: str) -> tuple[dict, str | None]:
+    try:
+        r = s3.get_object(Bucket=bucket, Key=CATALOG_KEY)
+    except ClientError as e:
+        if e.response["Error"]["Code"] == "NoSuchKey":
+            return {"updated_at": None, "series": {}}, None
+        raise
+    return json.loads(r["Body"].read()), r["ETag"]
+
+
+def build_entry(
+    key: str,
+    data: list,
+    cycle: str,
+    data_hash: str,
+    updated_at: str,
+    derived: list[str] | None = None,
+) -> dict:
+    last_period = next((p["x"] for p in reversed(data) if p["y"] is not None), None)
+    entry = {
+        "key": key,
+        "cycle": cycle,
+        "last_period": last_period,
+        "count": len(data),
+        "hash": data_hash,
+        "updated_at": updated_at,
+    }
+    if derived:
+        entry["derived"] = derived
+    return entry
+
+
+def update_entry(bucket: str, entry: dict) -> bool:
+    """
+    카탈로그에서 자기 시계열 항목만 교체한다.
+    다른 수집기와 동시에 쓰면 IfMatch 가 실패하므로 잠시 기다렸다가 다시 읽어서 재시도.
+    끝내 충돌하면 CatalogConflict.
+    반환: 실제로 썼는지 여부
+    """
+    for attempt in range(1, WRITE_ATTEMPTS + 1):
+        catalog, etag = load_catalog(bucket)
+
+        if catalog["series"].get(entry["key"]) == entry:
+            return False
+
+        catalog["series"][entry["key"]] = entry
+        catalog["updated_at"] = datetime.utcnow().isoformat()
+
+        condition = {"IfMatch": etag} if etag else {"IfNoneMatch": "*"}
+        try:
+            s3.put_object(
+                Bucket=bucket,
+                Key=CATALOG_KEY,
+                Body=json.dumps(catalog, ensure_ascii=False, sort_keys=True).encode("utf-8"),
+                ContentType="application/json",
+                CacheControl="max-age=300",
+                **condition,
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] not in PRECONDITION_ERRORS:
+                raise
+            if attempt == WRITE_ATTEMPTS:
+                raise CatalogConflict(
+                    f"{CATALOG_KEY}: {WRITE_ATTEMPTS} conflicting writes for {entry['key']}"
+                ) from e
+            # 동시에 시작한 수집기들이 같은 순간에 다시 부딪치지 않도록 흩어 놓는다
+            time.sleep(random.uniform(0, min(BACKOFF_CAP_SECONDS, BACKOFF_BASE_SECONDS * 2 ** (attempt - 1))))
+            continue
+
+        return True
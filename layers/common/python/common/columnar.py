@@ -0,0 +1,97 @@
+import gzip
+import json
+
+import numpy as np
+
+try:
+    import brotli
+except ImportError:  # 레이어에 brotli 가 없으면 gzip 만 생성
+    brotli = None
+
+FORMAT_VERSION = 1
+
+# 분기 데이터는 분기 말월(3, 6, 9, 12)만 값으로 담는다
+STEPS = {"M": 1, "Q": 3}
+
+
+# -----------------------------
+# 압축 열(columnar) 포맷
+# -----------------------------
+# {"v": 1, "start": "2003-03", "freq": "Q", "values": [98.1, 101.7, null, ...]}
+#
+# values[i] 의 기간 = start + i * (freq 의 개월 수)
+# x 문자열과 키 반복이 없어 JSON 대비 수 배 작고, 클라이언트는 배열만 읽으면 된다.
+
+
+def columnar_key(key: str, encoding: str) -> str:
+    """data/cpi-korea.json → data/cpi-korea.col.json.gz"""
+    stem = key[:-len(".json")] if key.endswith(".json") else key
+    return f"{stem}.col.json.{encoding}"
+
+
+def period_str(month: int) -> str:
+    return str(np.datetime64(int(month), "M"))
+
+
+def to_columnar(points: list, cycle: str) -> dict:
+    step = STEPS.get(cycle, 1)
+    if not points:
+        return {"v": FORMAT_VERSION, "start": None, "freq": cycle, "values": []}
+
+    months = np.asarray([p["x"] for p in points], dtype="datetime64[M]").astype(np.int64)
+    values = np.array([p["y"] for p in points], dtype=float)
+
+    # 분기: 첫 분기 말월부터 3개월 간격
+    start = months[0] + (-(months[0] + 1) % step)
+    slots = months - start
+    on_grid = (slots >= 0) & (slots % step == 0)
+
+    packed = np.full((months[-1] - start) // step + 1, np.nan)
+    packed[slots[on_grid] // step] = values[on_grid]
+
+    return {
+        "v": FORMAT_VERSION,
+        "start": period_str(start),
+        "freq": cycle,
+        "values": [None if np.isnan(v) else v for v in packed.tolist()],
+    }
+
+
+def from_columnar(doc: dict) -> list:
+    """
+    columnar → 기존 [{x, y}] 형태.
+    분기 데이터는 기존처럼 분기 앞 2개월을 null 로 채운다.
+    """
+    if not doc.get("values"):
+        return []
+
+    step = STEPS.get(doc["freq"], 1)
+    start = np.datetime64(doc["start"], "M").astype(np.int64)
+
+    points = []
+    for i, y in enumerate(doc["values"]):
+        month = start + i * step
+        for m in range(month - step + 1, month):
+            points.append({"x": period_str(m), "y": None})
+        points.append({"x": period_str(month), "y": y})
+    return points
+
+
+def encode(doc: dict) -> dict[str, bytes]:
+    """
+    인코딩별 압축 바이트. (mtime=0 → 같은 내용이면 같은 바이트)
+    """
+    raw = json.dumps(doc, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    encoded = {"gz": gzip.compress(raw, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        encoded["br"] = brotli.compress(raw, quality=11)
+    return encoded
+
+
+def decode(body: bytes, encoding: str) -> dict:
+    if encoding == "br":
+        if brotli is None:
+            raise RuntimeError("brotli is not installed")
+        return json.loads(brotli.decompress(body))
+    return json.loads(gzip.decompress(body))
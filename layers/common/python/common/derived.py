@@ -0,0 +1,106 @@
+import numpy as np
+
+# -----------------------------
+# 파생 시계열 정의
+# -----------------------------
+# pct → lag 개월 전 대비 증감률(%)
+# ma  → step 개월 간격 관측치 window 개의 이동평균
+# (분기 데이터는 월 단위 null 슬롯으로 저장되므로 step=3)
+TRANSFORMS = {
+    "M": {
+        "yoy": {"kind": "pct", "lag": 12},
+        "mom": {"kind": "pct", "lag": 1},
+        "ma3": {"kind": "ma", "window": 3, "step": 1},
+        "ma12": {"kind": "ma", "window": 12, "step": 1},
+    },
+    "Q": {
+        "yoy": {"kind": "pct", "lag": 12},
+        "qoq": {"kind": "pct", "lag": 3},
+        "ma4": {"kind": "ma", "window": 4, "step": 3},
+    },
+}
+
+DECIMALS = 4
+
+
+def transform_names(cycle: str) -> list[str]:
+    return list(TRANSFORMS.get(cycle, TRANSFORMS["M"]))
+
+
+def derived_key(key: str, name: str) -> str:
+    """data/cpi-korea.json → data/cpi-korea.yoy.json"""
+    stem = key[:-len(".json")] if key.endswith(".json") else key
+    return f"{stem}.{name}.json"
+
+
+def lookback(spec: dict) -> int:
+    if spec["kind"] == "pct":
+        return spec["lag"]
+    return (spec["window"] - 1) * spec["step"]
+
+
+def to_months(periods) -> np.ndarray:
+    """'YYYY-MM' 배열 → 1970-01 기준 월 번호"""
+    return np.asarray(periods, dtype="datetime64[M]").astype(np.int64)
+
+
+def pct_change(values: np.ndarray, lag: int) -> np.ndarray:
+    out = np.full(values.shape, np.nan)
+    if lag < len(values):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out[lag:] = (values[lag:] / values[:-lag] - 1.0) * 100.0
+    out[~np.isfinite(out)] = np.nan
+    return out
+
+
+def moving_average(values: np.ndarray, window: int, step: int) -> np.ndarray:
+    span = (window - 1) * step + 1
+    out = np.full(values.shape, np.nan)
+    if span <= len(values):
+        windows = np.lib.stride_tricks.sliding_window_view(values, span)[:, ::step]
+        out[span - 1:] = windows.mean(axis=1)
+    return out
+
+
+def compute(values: np.ndarray, spec: dict) -> np.ndarray:
+    if spec["kind"] == "pct":
+        return pct_change(values, spec["lag"])
+    return moving_average(values, spec["window"], spec["step"])
+
+
+def derive_series(points: list, cycle: str, since: str | None = None) -> dict[str, list]:
+    """
+    points([{x, y}], x 정렬) 로부터 파생 시계열을 계산한다.
+
+    since 를 주면 since 이후 기간만 계산해 반환한다.
+    (새로 추가·수정된 기간이 영향을 주는 꼬리 구간만 다시 계산)
+    출력은 원본과 같은 x 목록을 유지하고 계산 불가 구간은 null.
+    """
+    transforms = TRANSFORMS.get(cycle, TRANSFORMS["M"])
+    if not points:
+        return {name: [] for name in transforms}
+
+    periods = [p["x"] for p in points]
+    months = to_months(periods)
+    values = np.array([p["y"] for p in points], dtype=float)
+
+    # 월 단위 연속 배열 (빈 월은 NaN)
+    dense = np.full(months[-1] - months[0] + 1, np.nan)
+    dense[months - months[0]] = values
+
+    first = 0 if since is None else int(np.searchsorted(periods, since))
+    tail_pos = months[first:] - months[0]
+
+    derived = {}
+    for name, spec in transforms.items():
+        # 꼬리 계산에 필요한 만큼만 앞부분을 포함
+        start = max(0, (tail_pos[0] if len(tail_pos) else 0) - lookback(spec))
+        window = compute(dense[start:], spec)
+        tail = np.round(window[tail_pos - start], DECIMALS)
+
+        derived[name] = [
+            {"x": x, "y": None if np.isnan(y) else float(y)}
+            for x, y in zip(periods[first:], tail.tolist())
+        ]
+
+    return derived
@@ -0,0 +1,241 @@
+import bisect
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import boto3
+from botocore.exceptions import ClientError
+
+s3 = boto3.client("s3")
+
+HISTORY_PREFIX = "history"
+
+# delta 가 이만큼 쌓이면 전체 스냅샷(checkpoint)을 새로 남긴다
+CHECKPOINT_EVERY = 12
+WRITE_ATTEMPTS = 3
+FETCH_WORKERS = 8
+# manifest 에 없는 리비전 번호(고아 객체)를 건너뛰는 최대 횟수
+MAX_REVISION_SKIP = 20
+
+PRECONDITION_ERRORS = {"PreconditionFailed", "ConditionalRequestConflict"}
+
+# -----------------------------
+# 저장 구조
+# -----------------------------
+# history/{series}/manifest.json   → 리비전 목록 (rev, at, type, hash)
+# history/{series}/000001.json     → checkpoint {"data": [...]}
+# history/{series}/000002.json     → delta      {"set": {x: y}, "del": [x]}
+#
+# 리비전 객체는 IfNoneMatch 로만 생성하므로 한 번 쓰면 바뀌지 않는다.
+# manifest 커밋 전에 실패하면 manifest 에 없는 고아 객체가 남는데,
+# 덮어쓰지 않고 다음 번호로 건너뛴다 (번호는 manifest 에 적힌 것만 유효).
+
+
+def history_prefix(key: str) -> str:
+    stem = key[:-len(".json")] if key.endswith(".json") else key
+    return f"{HISTORY_PREFIX}/{stem}"
+
+
+def revision_key(key: str, rev: int) -> str:
+    return f"{history_prefix(key)}/{rev:06d}.json"
+
+
+def load_manifest(bucket: str, key: str) -> tuple[dict, str | None]:
+    try:
+        r = s3.get_object(Bucket=bucket, Key=f"{history_prefix(key)}/manifest.json")
+    except ClientError as e:
+        if e.response["Error"]["Code"] == "NoSuchKey":
+            return {"key": key, "revisions": []}, None
+        raise
+    return json.loads(r["Body"].read()), r["ETag"]
+
+
+def put_json(bucket: str, key: str, payload: dict, **condition):
+    s3.put_object(
+        Bucket=bucket,
+        Key=key,
+        Body=json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+        ContentType="application/json",
+        **condition,
+    )
+
+
+# -----------------------------
+# delta
+# -----------------------------
+def diff_series(old: list, new: list) -> dict:
+    before = {item["x"]: item["y"] for item in old}
+    after = {item["x"]: item["y"] for item in new}
+    return {
+        "set": {x: y for x, y in after.items() if x not in before or before[x] != y},
+        "del": sorted(before.keys() - after.keys()),
+    }
+
+
+def apply_patch(data: list, patch: dict) -> list:
+    merged = {item["x"]: item["y"] for item in data}
+    for x in patch.get("del", []):
+        merged.pop(x, None)
+    merged.update(patch.get("set", {}))
+    return [{"x": x, "y": merged[x]} for x in sorted(merged)]
+
+
+def plan_revisions(
+    revisions: list,
+    old_data: list,
+    old_hash: str,
+    old_at: str | None,
+    new_data: list,
+    new_hash: str,
+    patch: dict,
+    now: str,
+) -> list[dict]:
+    """
+    이번 변경으로 추가할 리비전 목록을 만든다.
+
+    - 이력이 없는데 기존 데이터가 있으면 먼저 기존 상태를 checkpoint 로 남긴다
+    - 마지막 리비전 해시가 변경 전 해시와 다르면 (중간 변경 누락) delta 대신 checkpoint
+    - 마지막 checkpoint 이후 delta 가 CHECKPOINT_EVERY 개 이상이면 checkpoint
+    """
+    planned = []
+    head_hash = revisions[-1]["hash"] if revisions else None
+    since_checkpoint = 0
+    for r in reversed(revisions):
+        if r["type"] == "checkpoint":
+            break
+        since_checkpoint += 1
+
+    if not revisions and old_data:
+        planned.append({
+            "type": "checkpoint",
+            "at": old_at or now,
+            "hash": old_hash,
+            "body": {"data": old_data},
+        })
+        head_hash = old_hash
+        since_checkpoint = 0
+
+    if head_hash == old_hash and since_checkpoint < CHECKPOINT_EVERY:
+        planned.append({"type": "delta", "at": now, "hash": new_hash, "body": patch})
+    else:
+        planned.append({"type": "checkpoint", "at": now, "hash": new_hash, "body": {"data": new_data}})
+
+    return planned
+
+
+def put_revision(bucket: str, key: str, rev: int, payload: dict) -> int:
+    """
+    rev 부터 비어 있는 첫 번호에 리비전 객체를 만들고 그 번호를 돌려준다.
+    이미 있는 번호는 고아 객체이거나 동시 실행이 쓰는 중인 객체이므로 건드리지 않는다.
+    """
+    for _ in range(MAX_REVISION_SKIP):
+        try:
+            put_json(bucket, revision_key(key, rev), {"rev": rev, **payload}, IfNoneMatch="*")
+            return rev
+        except ClientError as e:
+            if e.response["Error"]["Code"] not in PRECONDITION_ERRORS:
+                raise
+            rev += 1
+
+    raise RuntimeError(f"no free revision number for {key} below {rev}")
+
+
+def record_revision(
+    bucket: str,
+    key: str,
+    old_data: list,
+    old_hash: str,
+    old_at: str | None,
+    new_data: list,
+    new_hash: str,
+    patch: dict,
+) -> int:
+    """
+    변경된 기간만 담은 delta(또는 주기적 checkpoint)를 이력에 추가한다.
+    반환값은 새 head 리비전 번호.
+    """
+    now = datetime.utcnow().isoformat()
+    # 앞선 시도에서 이미 차지한 번호는 다시 시도하지 않는다
+    floor = 1
+
+    for attempt in range(1, WRITE_ATTEMPTS + 1):
+        manifest, etag = load_manifest(bucket, key)
+        revisions = manifest["revisions"]
+        next_rev = max(revisions[-1]["rev"] + 1 if revisions else 1, floor)
+
+        planned = plan_revisions(
+            revisions, old_data, old_hash, old_at, new_data, new_hash, patch, now
+        )
+
+        try:
+            rev = next_rev
+            for entry in planned:
+                rev = put_revision(bucket, key, rev, {"at": entry["at"], **entry["body"]})
+                floor = rev + 1
+                revisions.append({
+                    "rev": rev,
+                    "at": entry["at"],
+                    "type": entry["type"],
+                    "hash": entry["hash"],
+                })
+                rev += 1
+
+            condition = {"IfMatch": etag} if etag else {"IfNoneMatch": "*"}
+            put_json(bucket, f"{history_prefix(key)}/manifest.json", manifest, **condition)
+
+        except ClientError as e:
+            code = e.response["Error"]["Code"]
+            if attempt < WRITE_ATTEMPTS and code in PRECONDITION_ERRORS:
+                continue
+            raise
+
+        return revisions[-1]["rev"]
+
+
+# -----------------------------
+# as-of 복원
+# -----------------------------
+def revisions_until(manifest: dict, as_of: str) -> list[dict]:
+    """
+    as_of 시점까지 유효한 리비전 중 마지막 checkpoint 부터의 구간.
+    날짜만 주면 (YYYY-MM-DD) 그날 끝까지 포함한다.
+    """
+    if len(as_of) == 10:
+        as_of = f"{as_of}T23:59:59.999999"
+
+    revisions = manifest["revisions"]
+    end = bisect.bisect_right([r["at"] for r in revisions], as_of)
+    if end == 0:
+        return []
+
+    start = end - 1
+    while start > 0 and revisions[start]["type"] != "checkpoint":
+        start -= 1
+    return revisions[start:end]
+
+
+def load_revision(bucket: str, key: str, rev: int) -> dict:
+    r = s3.get_object(Bucket=bucket, Key=revision_key(key, rev))
+    return json.loads(r["Body"].read())
+
+
+def series_as_of(bucket: str, key: str, as_of: str) -> list:
+    """
+    as_of 시점에 공개되어 있던 시계열을 복원한다.
+    checkpoint 1개 + 이후 delta 들만 병렬로 읽어 순서대로 적용.
+    """
+    manifest, _ = load_manifest(bucket, key)
+    chain = revisions_until(manifest, as_of)
+    if not chain:
+        return []
+
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as pool:
+        bodies = list(pool.map(lambda r: load_revision(bucket, key, r["rev"]), chain))
+
+    data = bodies[0].get("data", [])
+    for body in bodies[1:]:
+        if "data" in body:
+            data = body["data"]
+        else:
+            data = apply_patch(data, body)
+    return data
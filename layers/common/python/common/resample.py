@@ -0,0 +1,120 @@
+import numpy as np
+
+# -----------------------------
+# 일봉 → 월/분기/연 리샘플링
+# -----------------------------
+# times  : datetime64 배열 (오름차순이 아니면 정렬)
+# values : float 배열 (None → NaN, 결측은 집계에서 제외)
+# 구간은 월 번호(1970-01 기준)를 freq 만큼 묶어서 구하고
+# 구간 경계만 찾은 뒤 reduceat 으로 한 번에 집계한다.
+#
+# 분기 라벨은 기존 분기 데이터처럼 분기 말월(YYYY-03/06/09/12),
+# 연 라벨은 YYYY.
+
+MONTHS_PER_BUCKET = {"M": 1, "Q": 3, "Y": 12}
+AGGREGATIONS = ("last", "first", "mean", "max", "min", "vwap")
+
+
+def from_epoch(timestamps) -> np.ndarray:
+    """epoch 초(Yahoo timestamp) → datetime64[s]"""
+    return np.asarray(timestamps, dtype=np.int64).astype("datetime64[s]")
+
+
+def from_yyyymmdd(dates) -> np.ndarray:
+    """YYYYMMDD 정수(KRX basDd) → datetime64[D]"""
+    dates = np.asarray(dates, dtype=np.int64)
+    months = (dates // 10000 - 1970) * 12 + dates // 100 % 100 - 1
+    return months.astype("datetime64[M]").astype("datetime64[D]") + (dates % 100 - 1)
+
+
+def bucket_ids(times: np.ndarray, freq: str) -> np.ndarray:
+    months = times.astype("datetime64[M]").astype(np.int64)
+    return months // MONTHS_PER_BUCKET[freq]
+
+
+def bucket_labels(ids: np.ndarray, freq: str) -> list[str]:
+    if freq == "Y":
+        return [str(1970 + i) for i in ids.tolist()]
+    step = MONTHS_PER_BUCKET[freq]
+    end_months = (ids * step + step - 1).astype("datetime64[M]")
+    return np.datetime_as_string(end_months, unit="M").tolist()
+
+
+def aggregate(
+    values: np.ndarray,
+    starts: np.ndarray,
+    how: str,
+    volume: np.ndarray | None = None,
+) -> np.ndarray:
+    ends = np.r_[starts[1:], len(values)] - 1
+
+    if how == "last":
+        return values[ends]
+    if how == "first":
+        return values[starts]
+    if how == "mean":
+        return np.add.reduceat(values, starts) / (ends - starts + 1)
+    if how == "max":
+        return np.maximum.reduceat(values, starts)
+    if how == "min":
+        return np.minimum.reduceat(values, starts)
+    if how == "vwap":
+        if volume is None:
+            raise ValueError("vwap requires volume")
+        # 거래량이 없거나 0 인 봉은 vwap 에서만 뺀다 (다른 집계는 그대로)
+        weights = np.where(volume > 0, volume, 0.0)
+        traded = np.add.reduceat(weights, starts)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.add.reduceat(values * weights, starts) / traded
+    raise ValueError(f"unknown aggregation: {how}")
+
+
+def resample(
+    times,
+    values,
+    how: str | list[str] = "last",
+    freq: str = "M",
+    volume=None,
+    until: str | None = None,
+    decimals: int | None = None,
+) -> dict[str, list]:
+    """
+    일봉을 freq 구간으로 집계해 집계별 [{x, y}] 를 돌려준다.
+
+    until(YYYY-MM) 을 주면 그 달 1일 이전 데이터만 사용 (끝난 달만 집계).
+    vwap 은 volume 이 없거나 0 인 봉을 제외한다 (구간 전체가 그렇다면 None).
+    """
+    names = [how] if isinstance(how, str) else list(how)
+
+    times = np.asarray(times)
+    values = np.asarray(values, dtype=float)
+    keep = ~np.isnan(values)
+    if volume is not None:
+        volume = np.asarray(volume, dtype=float)
+    if until is not None:
+        keep &= times < np.datetime64(until, "M").astype(times.dtype)
+
+    times, values = times[keep], values[keep]
+    volume = volume[keep] if volume is not None else None
+    if not len(times):
+        return {name: [] for name in names}
+
+    if np.any(times[1:] < times[:-1]):
+        order = np.argsort(times, kind="stable")
+        times, values = times[order], values[order]
+        volume = volume[order] if volume is not None else None
+
+    ids = bucket_ids(times, freq)
+    starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+    labels = bucket_labels(ids[starts], freq)
+
+    out = {}
+    for name in names:
+        result = aggregate(values, starts, name, volume)
+        if decimals is not None:
+            result = np.round(result, decimals)
+        out[name] = [
+            {"x": x, "y": None if np.isnan(y) else float(y)}
+            for x, y in zip(labels, result.tolist())
+        ]
+    return out
@@ -0,0 +1,381 @@
+from common import columnar as col
+from common.catalog import CatalogConflict, build_entry, update_entry
+from common.derived import derive_series, derived_key, transform_names
+from common.history import record_revision
+import hashlib
+import json
+import boto3
+from botocore.exceptions import ClientError
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+s3 = boto3.client("s3")
+
+# 조건부 쓰기(IfMatch) 충돌 시 재시도 횟수
+WRITE_ATTEMPTS = 3
+PRECONDITION_ERRORS = {"PreconditionFailed", "ConditionalRequestConflict"}
+
+# 시계열과 함께 만드는 부속 객체(파생 시계열, columnar, 카탈로그 항목)의 버전.
+# 작은 표시 객체(meta/artifacts/...)에 시계열 해시와 함께 기록해 두고,
+# 다르거나 없으면 변경이 없어도 한 번 다시 만든다.
+ARTIFACTS_VERSION = "2"
+ARTIFACTS_PREFIX = "meta/artifacts"
+
+
+def hash_list(data: list) -> str:
+    """
+    리스트 전체를 안정적으로 해시하기 위해
+    key 정렬 + UTF-8 인코딩 후 SHA256 적용
+    """
+    raw = json.dumps(data, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()
+
+
+# -----------------------------
+# S3 입출력
+# -----------------------------
+def load_series(bucket: str, key: str) -> dict:
+    """
+    기존 시계열과 ETag를 함께 로드한다.
+    객체가 없으면 빈 시계열(etag=None)로 취급한다.
+    """
+    try:
+        r = s3.get_object(Bucket=bucket, Key=key)
+    except ClientError as e:
+        if e.response["Error"]["Code"] == "NoSuchKey":
+            return {"data": [], "etag": None, "last_modified": None}
+        raise
+
+    data = json.loads(r["Body"].read())
+    if not isinstance(data, list):
+        raise RuntimeError("Existing data is not a list")
+
+    return {
+        "data": data,
+        "etag": r["ETag"],
+        "last_modified": r["LastModified"],
+    }
+
+
+def load_columnar(bucket: str, key: str, encoding: str = "gz") -> list:
+    """columnar 객체를 읽어 기존 [{x, y}] 형태로 돌려준다."""
+    r = s3.get_object(Bucket=bucket, Key=col.columnar_key(key, encoding))
+    return col.from_columnar(col.decode(r["Body"].read(), encoding))
+
+
+def write_series(
+    bucket: str,
+    key: str,
+    data: list,
+    data_hash: str,
+    etag: str | None,
+):
+    """
+    읽었던 시점의 ETag와 같을 때만 덮어쓴다.
+    (신규 객체는 IfNoneMatch 로 동시 생성 방지)
+    """
+    condition = {"IfMatch": etag} if etag else {"IfNoneMatch": "*"}
+
+    s3.put_object(
+        Bucket=bucket,
+        Key=key,
+        Body=json.dumps(data, ensure_ascii=False).encode("utf-8"),
+        ContentType="application/json",
+        CacheControl="max-age=3600",
+        Metadata={"sha256": data_hash},
+        **condition,
+    )
+
+
+def write_columnar(bucket: str, key: str, data: list, cycle: str) -> list[str]:
+    """
+    columnar 포맷을 미리 압축해 ContentEncoding 과 함께 올린다.
+    (gzip 은 항상, brotli 는 설치된 경우에만)
+    """
+    written = []
+    for encoding, body in col.encode(col.to_columnar(data, cycle)).items():
+        ckey = col.columnar_key(key, encoding)
+        s3.put_object(
+            Bucket=bucket,
+            Key=ckey,
+            Body=body,
+            ContentType="application/json",
+            ContentEncoding="gzip" if encoding == "gz" else encoding,
+            CacheControl="max-age=3600",
+        )
+        written.append(ckey)
+    return written
+
+
+def is_precondition_failure(e: ClientError) -> bool:
+    return e.response["Error"]["Code"] in PRECONDITION_ERRORS
+
+
+def artifacts_key(key: str) -> str:
+    stem = key[:-len(".json")] if key.endswith(".json") else key
+    return f"{ARTIFACTS_PREFIX}/{stem}.json"
+
+
+def artifacts_current(bucket: str, key: str, data_hash: str) -> bool:
+    """부속 객체가 지금 버전으로, 이 내용(data_hash) 기준으로 만들어져 있는지"""
+    try:
+        r = s3.get_object(Bucket=bucket, Key=artifacts_key(key))
+    except ClientError as e:
+        if e.response["Error"]["Code"] == "NoSuchKey":
+            return False
+        raise
+    marker = json.loads(r["Body"].read())
+    return marker.get("version") == ARTIFACTS_VERSION and marker.get("hash") == data_hash
+
+
+def mark_artifacts(bucket: str, key: str, data_hash: str):
+    """
+    이력 · 부속 객체를 모두 만든 뒤에만 표시를 남긴다 (시계열 객체는 다시 쓰지 않는다).
+    중간에 실패하면 표시가 없으므로 다음 실행의 NO_CHANGE 경로가 다시 만든다.
+    동시 실행이 다른 내용의 해시로 덮어써도 해시가 맞지 않으면 한 번 다시 만들 뿐이다.
+    """
+    s3.put_object(
+        Bucket=bucket,
+        Key=artifacts_key(key),
+        Body=json.dumps({
+            "version": ARTIFACTS_VERSION,
+            "hash": data_hash,
+            "updated_at": datetime.utcnow().isoformat(),
+        }).encode("utf-8"),
+        ContentType="application/json",
+    )
+
+
+# -----------------------------
+# 병합
+# -----------------------------
+def merge_points(
+    existing: list,
+    points: list,
+    replace: bool = False,
+    overwrite: bool = True,
+) -> tuple[list, dict, list]:
+    """
+    기간(x) 기준 upsert.
+
+    replace=True   → points 가 전체 시계열 (매번 전체를 조회하는 수집기)
+    overwrite=False → 이미 있는 기간은 건드리지 않음 (append-only)
+
+    반환: (정렬된 시계열, 추가/변경된 기간 {x: y}, 삭제된 기간 [x])
+    """
+    current = {item["x"]: item["y"] for item in existing}
+    incoming = {item["x"]: item["y"] for item in points}
+
+    if replace:
+        merged = incoming
+        removed = sorted(current.keys() - incoming.keys())
+    else:
+        merged = dict(current)
+        removed = []
+        for x, y in incoming.items():
+            if overwrite or x not in merged:
+                merged[x] = y
+
+    changed = {
+        x: y for x, y in merged.items()
+        if x not in current or current[x] != y
+    }
+    data = [{"x": x, "y": merged[x]} for x in sorted(merged)]
+    return data, changed, removed
+
+
+# -----------------------------
+# 파생 시계열 (YoY, MoM, 이동평균)
+# -----------------------------
+def publish_derived(bucket: str, key: str, data: list, cycle: str, since: str | None) -> list[str]:
+    """
+    since 이후 꼬리 구간만 다시 계산해 기존 파생 시계열 앞부분에 이어 붙인다.
+    앞부분이 원본과 맞지 않으면(최초 생성 등) 전체를 다시 계산한다.
+    """
+    tails = derive_series(data, cycle, since)
+    full = None
+    expected_prefix = [p["x"] for p in data if since is not None and p["x"] < since]
+
+    def publish_one(name: str) -> str | None:
+        nonlocal full
+        dkey = derived_key(key, name)
+        snapshot = load_series(bucket, dkey)
+
+        prefix = [p for p in snapshot["data"] if since is not None and p["x"] < since]
+        if [p["x"] for p in prefix] == expected_prefix:
+            series = prefix + tails[name]
+        else:
+            full = full or derive_series(data, cycle)
+            series = full[name]
+
+        new_hash = hash_list(series)
+        if new_hash == hash_list(snapshot["data"]):
+            return None
+
+        try:
+            write_series(bucket, dkey, series, new_hash, snapshot["etag"])
+        except ClientError as e:
+            # 파생 시계열은 언제든 다시 계산 가능 → 동시 실행과 충돌하면 먼저 쓴 쪽을 유지
+            if is_precondition_failure(e):
+                return None
+            raise
+        return dkey
+
+    with ThreadPoolExecutor(max_workers=len(tails) or 1) as pool:
+        written = list(pool.map(publish_one, tails))
+    return [k for k in written if k]
+
+
+def publish_artifacts(
+    bucket: str,
+    key: str,
+    data: list,
+    data_hash: str,
+    updated_at: str,
+    cycle: str,
+    since: str | None,
+    derived: bool,
+    columnar: bool,
+    catalog: bool,
+) -> dict:
+    artifacts = {}
+    if derived:
+        artifacts["derived"] = publish_derived(bucket, key, data, cycle, since)
+    if columnar:
+        artifacts["columnar"] = write_columnar(bucket, key, data, cycle)
+    if catalog:
+        entry = build_entry(
+            key,
+            data,
+            cycle,
+            data_hash,
+            updated_at,
+            derived=transform_names(cycle) if derived else None,
+        )
+        try:
+            artifacts["catalog"] = update_entry(bucket, entry)
+        except CatalogConflict as e:
+            # 시계열은 이미 올라갔으므로 실패시키지 않는다.
+            # 부속 객체 표시를 남기지 않아 다음 실행(NO_CHANGE 경로)이 항목을 다시 쓴다.
+            artifacts["catalog"] = False
+            artifacts["catalog_error"] = str(e)
+    return artifacts
+
+
+# -----------------------------
+# 공개 API
+# -----------------------------
+def publish_series(
+    bucket: str,
+    key: str,
+    points: list,
+    replace: bool = False,
+    overwrite: bool = True,
+    history: bool = True,
+    cycle: str = "M",
+    derived: bool = True,
+    columnar: bool = True,
+    catalog: bool = True,
+) -> dict:
+    """
+    수집한 points 를 기존 시계열에 병합해 변경이 있을 때만 업로드한다.
+
+    1️⃣ 기존 데이터 로드 (ETag 포함)
+    2️⃣ 기간 기준 병합
+    3️⃣ 개수 감소 방지
+    4️⃣ 변경 기간이 없으면 skip
+    5️⃣ 조건부 업로드 (다른 실행이 먼저 썼으면 다시 로드 후 재시도)
+    6️⃣ 변경 기간만 이력(history)에 delta 로 기록
+    7️⃣ 영향받는 꼬리 구간만 파생 시계열(YoY 등) 재계산
+    8️⃣ 압축 columnar 포맷을 기존 JSON 옆에 함께 게시
+    9️⃣ data/index.json 카탈로그의 자기 항목 갱신
+    """
+    if not points:
+        return {
+            "status": "NO_DATA",
+            "count": 0,
+        }
+
+    with_artifacts = derived or columnar or catalog
+
+    for attempt in range(1, WRITE_ATTEMPTS + 1):
+        snapshot = load_series(bucket, key)
+        existing = snapshot["data"]
+
+        data, changed, removed = merge_points(
+            existing, points, replace=replace, overwrite=overwrite
+        )
+
+        old_count = len(existing)
+        new_count = len(data)
+
+        if new_count < old_count:
+            return {
+                "status": "SKIPPED_SHRINK",
+                "old_count": old_count,
+                "new_count": new_count,
+            }
+
+        if not changed and not removed:
+            result = {
+                "status": "NO_CHANGE",
+                "count": old_count,
+                "hash": hash_list(data),
+            }
+            # 부속 객체가 없거나 예전 버전이면 한 번 전체를 다시 만든다
+            if with_artifacts and not artifacts_current(bucket, key, result["hash"]):
+                last_modified = snapshot["last_modified"]
+                result.update(publish_artifacts(
+                    bucket, key, data, result["hash"],
+                    last_modified.replace(tzinfo=None).isoformat(),
+                    cycle, None, derived, columnar, catalog,
+                ))
+                if "catalog_error" not in result:
+                    mark_artifacts(bucket, key, result["hash"])
+            return result
+
+        existing_sorted = sorted(existing, key=lambda x: x["x"])
+        old_hash = hash_list(existing_sorted)
+        new_hash = hash_list(data)
+
+        try:
+            write_series(bucket, key, data, new_hash, snapshot["etag"])
+        except ClientError as e:
+            if attempt < WRITE_ATTEMPTS and is_precondition_failure(e):
+                continue
+            raise
+
+        result = {
+            "status": "SUCCESS",
+            "old_count": old_count,
+            "new_count": new_count,
+            "old_hash": old_hash,
+            "new_hash": new_hash,
+            "changed": len(changed) + len(removed),
+        }
+
+        if history:
+            last_modified = snapshot["last_modified"]
+            result["revision"] = record_revision(
+                bucket,
+                key,
+                old_data=existing_sorted,
+                old_hash=old_hash,
+                old_at=last_modified.replace(tzinfo=None).isoformat() if last_modified else None,
+                new_data=data,
+                new_hash=new_hash,
+                patch={"set": changed, "del": removed},
+            )
+
+        since = min([*changed, *removed])
+        result.update(publish_artifacts(
+            bucket, key, data, new_hash,
+            datetime.utcnow().isoformat(),
+            cycle, since, derived, columnar, catalog,
+        ))
+
+        # 이력 · 부속 객체가 모두 끝난 뒤에만 표시
+        if with_artifacts and "catalog_error" not in result:
+            mark_artifacts(bucket, key, new_hash)
+
+        return result
@@ -1,41 +1,107 @@
 from common.slack import send_slack_message
-import hashlib
+from common.store import publish_series
 import json
-import boto3
+import math
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import os
 import requests
-from botocore.exceptions import ClientError
 
-s3 = boto3.client("s3")
 BASE_URL = "https://www.reb.or.kr/r-one/openapi/SttsApiTblData.do"
+PAGE_SIZE = 1000
+PAGE_WORKERS = 4
+
+session = requests.Session()
 
 BUCKET_NAME = os.environ["S3_BUCKET_NAME"]
-OUTPUT_KEY = os.environ["S3_OUTPUT_KEY"]
 REB_API_KEY = os.environ["REB_API_KEY"]
-STATBL_ID = os.environ["STATBL_ID"]
-CLS_ID = os.environ["CLS_ID"]
+
+# 단일 시계열 모드 (함수 1개 = 시계열 1개)
+OUTPUT_KEY = os.environ.get("S3_OUTPUT_KEY")
+STATBL_ID = os.environ.get("STATBL_ID")
+CLS_ID = os.environ.get("CLS_ID")
 GRP_ID = os.environ.get("GRP_ID")
 ITM_ID = os.environ.get("ITM_ID")
 
-PARAMS = {
-    "KEY": REB_API_KEY,
-    "Type": "json",
-    "STATBL_ID": STATBL_ID,
-    "DTACYCLE_CD": "MM",
-    "CLS_ID": CLS_ID,
-    "pSize": 1000,
-}
 
-if GRP_ID:
-    PARAMS["GRP_ID"] = GRP_ID
-if ITM_ID:
-    PARAMS["ITM_ID"] = ITM_ID
+def build_params(
+    statbl_id: str,
+    cls_id: str | None = None,
+    grp_id: str | None = None,
+    itm_id: str | None = None,
+) -> dict:
+    params = {
+        "KEY": REB_API_KEY,
+        "Type": "json",
+        "STATBL_ID": statbl_id,
+        "DTACYCLE_CD": "MM",
+        "pSize": PAGE_SIZE,
+    }
+    if cls_id:
+        params["CLS_ID"] = cls_id
+    if grp_id:
+        params["GRP_ID"] = grp_id
+    if itm_id:
+        params["ITM_ID"] = itm_id
+    return params
+
+
+# -----------------------------
+# API 조회 (pIndex 페이지 순회)
+# -----------------------------
+def parse_page(data: dict) -> tuple[int, list]:
+    """
+    응답 → (list_total_count, 이번 페이지 row)
+    데이터가 없으면 SttsApiTblData 블록 없이 RESULT 만 온다.
+    """
+    blocks = data.get("SttsApiTblData")
+    if not blocks:
+        return 0, []
+
+    head = blocks[0].get("head", [])
+    total = next(
+        (h["list_total_count"] for h in head if "list_total_count" in h), 0
+    )
+    rows = blocks[1].get("row", []) if len(blocks) > 1 else []
+    return int(total), rows
+
+
+def fetch_page(params: dict, page: int) -> tuple[int, list]:
+    resp = session.get(BASE_URL, params={**params, "pIndex": page}, timeout=10)
+    resp.raise_for_status()
+    return parse_page(resp.json())
+
+
+def fetch_rows(params: dict) -> list:
+    """
+    1페이지 head 의 list_total_count 로 전체 페이지 수를 구하고
+    나머지 페이지는 병렬로 받아 페이지 순서대로 합친다.
+    합친 건수가 list_total_count 와 다르면 잘린 것으로 보고 실패 처리.
+    """
+    total, rows = fetch_page(params, 1)
+    pages = math.ceil(total / PAGE_SIZE)
+
+    if pages > 1:
+        with ThreadPoolExecutor(max_workers=min(PAGE_WORKERS, pages - 1)) as pool:
+            for page_total, page_rows in pool.map(
+                lambda page: fetch_page(params, page), range(2, pages + 1)
+            ):
+                if page_total != total:
+                    raise RuntimeError(
+                        f"REB list_total_count changed while paging: {total} → {page_total}"
+                    )
+                rows.extend(page_rows)
+
+    if len(rows) != total:
+        raise RuntimeError(
+            f"REB row count mismatch for {params['STATBL_ID']}: "
+            f"expected {total}, got {len(rows)}"
+        )
+    return rows
 
 
-def transform_data(data: dict) -> list:
+def transform_rows(rows: list) -> list:
     result = []
-    rows = data.get("SttsApiTblData", [])[1].get("row", [])
 
     for item in rows:
         date_str = (
@@ -55,104 +121,102 @@ def transform_data(data: dict) -> list:
     return result
 
 
-def load_existing_data() -> list:
-    try:
-        r = s3.get_object(Bucket=BUCKET_NAME, Key=OUTPUT_KEY)
-        return json.loads(r["Body"].read())
-    except ClientError as e:
-        raise
-
+# -----------------------------
+# 배치 모드: STATBL_ID 당 1회 조회 → CLS/GRP/ITM 별 분리
+# -----------------------------
+def split_rows(rows: list, series: list[dict]) -> dict[str, list]:
+    """
+    한 번 순회하며 (CLS_ID, GRP_ID, ITM_ID) 로 묶은 뒤 설정된 시계열마다 모은다.
+    설정에서 grp_id / itm_id 를 생략하면 해당 축은 전체와 매칭.
+    """
+    groups: dict[tuple, list] = {}
+    for row in rows:
+        ids = (str(row.get("CLS_ID")), str(row.get("GRP_ID")), str(row.get("ITM_ID")))
+        groups.setdefault(ids, []).append(row)
+
+    def matches(ids: tuple, spec: dict) -> bool:
+        cls_id, grp_id, itm_id = ids
+        return (
+            cls_id == str(spec["cls_id"])
+            and (not spec.get("grp_id") or grp_id == str(spec["grp_id"]))
+            and (not spec.get("itm_id") or itm_id == str(spec["itm_id"]))
+        )
 
-def upload_json(data: list):
-    s3.put_object(
-        Bucket=BUCKET_NAME,
-        Key=OUTPUT_KEY,
-        Body=json.dumps(data, ensure_ascii=False).encode("utf-8"),
-        ContentType="application/json",
-        CacheControl="max-age=3600",
-    )
+    return {
+        spec["key"]: [
+            row
+            for ids, group in groups.items() if matches(ids, spec)
+            for row in group
+        ]
+        for spec in series
+    }
 
 
-def hash_list(data: list) -> str:
+def run_batch(tables: list[dict]) -> dict:
     """
-    리스트 전체를 안정적으로 해시하기 위해
-    key 정렬 + UTF-8 인코딩 후 SHA256 적용
+    tables = [
+      {"statbl_id": "A_2024_00178",
+       "series": [{"cls_id": "500001", "key": "data/apt-price-index-all.json"}, ...]},
+      ...
+    ]
     """
-    raw = json.dumps(data, sort_keys=True, separators=(",", ":")).encode("utf-8")
-    return hashlib.sha256(raw).hexdigest()
+    results = []
 
+    for table in tables:
+        rows = fetch_rows(build_params(table["statbl_id"]))
+        by_key = split_rows(rows, table["series"])
 
-def run():
-    resp = requests.get(BASE_URL, params=PARAMS, timeout=10)
-    resp.raise_for_status()
+        for key, series_rows in by_key.items():
+            try:
+                result = publish_series(
+                    BUCKET_NAME, key, transform_rows(series_rows), replace=True
+                )
+            except Exception as e:
+                result = {"status": "ERROR", "error": str(e)}
 
-    transformed = transform_data(resp.json())
+            results.append({"key": key, "statbl_id": table["statbl_id"], **result})
 
-    if not transformed:
-        return {
-            "status": "NO_DATA",
-            "count": 0,
-        }
+    total = len(results)
+    failed = sum(1 for r in results if r["status"] == "ERROR")
 
-    # -----------------------------
-    # 1️⃣ 기존 데이터 로드
-    # -----------------------------
-    existing = load_existing_data()
-    if not isinstance(existing, list):
-        raise RuntimeError("Existing data is not a list")
+    if failed == 0:
+        status = "SUCCESS"
+    elif failed < total:
+        status = "PARTIAL_FAILURE"
+    else:
+        status = "FAILURE"
 
-    old_count = len(existing)
-    new_count = len(transformed)
-
-    # -----------------------------
-    # 2️⃣ 개수 감소 방지
-    # -----------------------------
-    if new_count < old_count:
-        return {
-            "status": "SKIPPED_SHRINK",
-            "old_count": old_count,
-            "new_count": new_count,
-        }
+    return {
+        "status": status,
+        "total": total,
+        "failed": failed,
+        "results": results,
+    }
 
-    # -----------------------------
-    # 3️⃣ 정렬 (해시 안정성)
-    # -----------------------------
-    existing_sorted = sorted(existing, key=lambda x: x["x"])
-    transformed_sorted = sorted(transformed, key=lambda x: x["x"])
 
-    old_hash = hash_list(existing_sorted)
-    new_hash = hash_list(transformed_sorted)
+def run():
+    rows = fetch_rows(build_params(STATBL_ID, CLS_ID, GRP_ID, ITM_ID))
+    transformed = transform_rows(rows)
 
-    # -----------------------------
-    # 4️⃣ 동일 데이터면 skip
-    # -----------------------------
-    if old_hash == new_hash:
+    if not transformed:
         return {
-            "status": "NO_CHANGE",
-            "count": old_count,
-            "hash": old_hash,
+            "status": "NO_DATA",
+            "count": 0,
         }
 
-    # -----------------------------
-    # 5️⃣ 변경 발생 시 업로드
-    # -----------------------------
-    upload_json(transformed_sorted)
-
-    return {
-        "status": "SUCCESS",
-        "old_count": old_count,
-        "new_count": new_count,
-        "old_hash": old_hash,
-        "new_hash": new_hash,
-    }
+    # 기간 기준 병합 · 개수 감소 방지 · 해시 비교 · 조건부 업로드
+    return publish_series(BUCKET_NAME, OUTPUT_KEY, transformed, replace=True)
 
 
 def lambda_handler(event, context):
+    tables = (event or {}).get("tables")
+    service = "REB | batch" if tables else f"REB | {OUTPUT_KEY}"
+
     try:
-        result = run()
+        result = run_batch(tables) if tables else run()
 
         send_slack_message(
-            service=f"REB | {OUTPUT_KEY}",
+            service=service,
             result=result
         )
 
@@ -163,7 +227,7 @@ def lambda_handler(event, context):
 
     except Exception as e:
         send_slack_message(
-            service=f"REB | {OUTPUT_KEY}",
+            service=service,
             message=str(e),
             status="ERROR",
         )
@@ -0,0 +1,63 @@
+from types import SimpleNamespace
+
+
+class FakeBatchAPI:
+    """
+    OpenAI Batch API 대역 (batches.create / retrieve 만).
+    가상 시계를 advance() 로 움직이면 상태가 바뀐다.
+      validating → in_progress (run_seconds) → finalizing → outcome
+    24시간 안에 끝나지 않으면 expired.
+    """
+
+    VALIDATING_SECONDS = 30
+    FINALIZING_SECONDS = 90
+    COMPLETION_WINDOW_SECONDS = 24 * 3600
+
+    def __init__(self, now: float = 1_760_000_000.0):
+        self.now = now
+        self.batches = {}
+        self.retrieve_calls = 0
+
+    def create(self, run_seconds: float, outcome: str = "completed") -> str:
+        batch_id = f"batch_{len(self.batches) + 1:04d}"
+        self.batches[batch_id] = {
+            "created_at": self.now,
+            "run_seconds": run_seconds,
+            "outcome": outcome,
+        }
+        return batch_id
+
+    def finished_at(self, batch_id: str) -> float:
+        b = self.batches[batch_id]
+        total = self.VALIDATING_SECONDS + b["run_seconds"] + self.FINALIZING_SECONDS
+        return b["created_at"] + min(total, self.COMPLETION_WINDOW_SECONDS)
+
+    def status(self, batch_id: str) -> str:
+        b = self.batches[batch_id]
+        age = self.now - b["created_at"]
+        in_progress_end = self.VALIDATING_SECONDS + b["run_seconds"]
+        total = in_progress_end + self.FINALIZING_SECONDS
+
+        if total > self.COMPLETION_WINDOW_SECONDS and age >= self.COMPLETION_WINDOW_SECONDS:
+            return "expired"
+        if age < self.VALIDATING_SECONDS:
+            return "validating"
+        if age < in_progress_end:
+            return "in_progress"
+        if age < in_progress_end + self.FINALIZING_SECONDS:
+            return "finalizing"
+        return b["outcome"]
+
+    def retrieve(self, batch_id: str):
+        self.retrieve_calls += 1
+        b = self.batches[batch_id]
+        status = self.status(batch_id)
+        return SimpleNamespace(
+            id=batch_id,
+            status=status,
+            created_at=int(b["created_at"]),
+            completed_at=int(self.finished_at(batch_id)) if status == "completed" else None,
+        )
+
+    def advance(self, seconds: float):
+        self.now += seconds
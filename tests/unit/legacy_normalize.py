@@ -0,0 +1,89 @@
+"""
+bok 정규화 함수의 분리 이전 구현 (app_issue.py 에 있던 그대로).
+bok/normalize.py 가 바이트 단위로 같은 결과를 내는지 비교하는 기준.
+"""
+import re
+
+
+def normalize_text(text: str) -> str:
+    text = text.replace("ž", "·")
+    lines = text.splitlines()
+    cleaned_lines = []
+
+    line_remove_patterns = [
+        r"^\s*\[?\s*(그림|표)\s*\d+",
+        r"^\s*주\s*[: ]?\s*\d+",
+        r"^\s*(자료|출처)\s*[: ]?",
+        r"^\s*-\s*\d+\s*-",
+    ]
+
+    for line in lines:
+        stripped = line.strip()
+        if not stripped:
+            continue
+        if any(re.search(p, stripped) for p in line_remove_patterns):
+            continue
+        cleaned_lines.append(stripped)
+
+    text = " ".join(cleaned_lines)
+    text = re.sub(r"\d+\)", " ", text)
+    text = re.sub(r"[^\w\s.,!?가-힣()/%\-ⅠⅡⅢⅣⅤⅥⅦⅧⅨⅩ]", " ", text)
+    text = re.sub(r"\s+", " ", text)
+
+    return text.strip()
+
+
+def unify_roman_and_symbols(text: str) -> str:
+    variants_I = [
+        "Ⅰ", "Ｉ", "𝑰", "𝐈", "𝘐", "𝕀", "𝖨", "𝗜", "𝛪",
+    ]
+    for v in variants_I:
+        text = text.replace(v, "I")
+
+    for v in ["–", "—", "−", "﹣", "‐"]:
+        text = text.replace(v, "-")
+
+    for v in ["。", "．", "｡"]:
+        text = text.replace(v, ".")
+
+    return text
+
+
+def remove_table_of_contents(text: str) -> str:
+    m = re.search(r"[ⅠI]\s*-\s*1", text)
+    if m:
+        return text[m.start():]
+    return text
+
+
+def cut_statistics_section(text: str) -> str:
+    m = re.search(r"주요\s*통계\s*및\s*참고", text)
+    if m:
+        return text[:m.start()].strip()
+    return text
+
+
+def clean_non_text_blocks(paragraph: str) -> str:
+    sents = re.split(r"(?<=[.!?])\s+", paragraph)
+    cleaned = []
+
+    for s in sents:
+        s = s.strip()
+        if not s:
+            continue
+
+        if re.search(r"^(그림|표)\s*\d+", s):
+            continue
+        if re.search(r"^주\s*\d+", s):
+            continue
+        if re.search(r"^(자료|출처)[: ]", s):
+            continue
+
+        tokens = s.split()
+        num_tokens = sum(1 for t in tokens if re.match(r"^[\d\.\-,/]+$", t))
+        if len(tokens) > 0 and num_tokens / len(tokens) > 0.6:
+            continue
+
+        cleaned.append(s)
+
+    return " ".join(cleaned).strip()
@@ -0,0 +1,35 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "bok"))
+# 테스트 환경에는 BPE 파일이 없으므로 기본 설정은 추정 모드로
+os.environ.setdefault("BOK_TOKENIZER", "len/3")
+
+import chunking  # noqa: E402
+
+
+def test_missing_bpe_file_fails_instead_of_estimating(monkeypatch, tmp_path):
+    monkeypatch.setattr(chunking, "TOKENIZER_DIR", str(tmp_path))
+    with pytest.raises(RuntimeError, match="BPE file is missing"):
+        chunking.check_tokenizer(chunking.ENCODING_NAME)
+
+
+@pytest.mark.skipif(chunking.tiktoken is None, reason="tiktoken not installed")
+def test_bundled_bpe_file_passes(monkeypatch, tmp_path):
+    monkeypatch.setattr(chunking, "TOKENIZER_DIR", str(tmp_path))
+    open(chunking.encoding_file(), "w").close()
+    chunking.check_tokenizer(chunking.ENCODING_NAME)
+
+
+def test_unknown_tokenizer_is_rejected():
+    with pytest.raises(RuntimeError, match="BOK_TOKENIZER"):
+        chunking.check_tokenizer("cl100k_base")
+
+
+def test_estimate_only_when_configured(monkeypatch):
+    monkeypatch.setattr(chunking, "TOKENIZER", chunking.ESTIMATE_TOKENIZER)
+    chunking.check_tokenizer(chunking.ESTIMATE_TOKENIZER)
+    assert chunking.count_tokens("가" * 30) == 10
+    assert chunking.tokenizer_name() == "len/3"
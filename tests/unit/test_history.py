@@ -0,0 +1,188 @@
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+from botocore.exceptions import ClientError
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "layers", "common", "python"))
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+from common import history  # noqa: E402
+
+BUCKET = "bucket"
+KEY = "data/series.json"
+EVERY = history.CHECKPOINT_EVERY
+
+
+class FakeS3:
+    """get_object / put_object (IfMatch · IfNoneMatch) 만 흉내 내는 S3 대역"""
+
+    def __init__(self):
+        self.objects = {}
+        self.version = 0
+
+    def error(self, code):
+        return ClientError({"Error": {"Code": code}}, "op")
+
+    def get_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise self.error("NoSuchKey")
+        body, etag = self.objects[Key]
+        return {"Body": type("B", (), {"read": lambda _: body})(), "ETag": etag}
+
+    def put_object(self, Bucket, Key, Body, IfMatch=None, IfNoneMatch=None, **kwargs):
+        current = self.objects.get(Key)
+        if IfNoneMatch == "*" and current:
+            raise self.error("PreconditionFailed")
+        if IfMatch and (not current or current[1] != IfMatch):
+            raise self.error("PreconditionFailed")
+        self.version += 1
+        self.objects[Key] = (Body, f'"{self.version}"')
+        return {"ETag": f'"{self.version}"'}
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    fake = FakeS3()
+    monkeypatch.setattr(history, "s3", fake)
+
+    # 리비전 시각이 겹치지 않도록 호출마다 1분씩 가는 시계
+    class Clock(datetime):
+        now_at = datetime(2024, 1, 1)
+
+        @classmethod
+        def utcnow(cls):
+            cls.now_at += timedelta(minutes=1)
+            return cls.now_at
+
+    monkeypatch.setattr(history, "datetime", Clock)
+    return fake
+
+
+def series(n: int) -> list:
+    return [{"x": f"2020-{m:02d}", "y": m * 1.5} for m in range(1, n + 1)]
+
+
+def publish(data_before: list, data_after: list, at: str | None = None) -> int:
+    return history.record_revision(
+        BUCKET,
+        KEY,
+        old_data=data_before,
+        old_hash=f"h{len(data_before)}",
+        old_at=at,
+        new_data=data_after,
+        new_hash=f"h{len(data_after)}",
+        patch=history.diff_series(data_before, data_after),
+    )
+
+
+def manifest(s3) -> dict:
+    return json.loads(s3.objects[f"{history.history_prefix(KEY)}/manifest.json"][0])
+
+
+# -----------------------------
+# plan_revisions
+# -----------------------------
+def test_first_change_checkpoints_existing_data_then_delta():
+    planned = history.plan_revisions(
+        [], series(2), "h2", "2024-01-01T00:00:00", series(3), "h3", {"set": {}, "del": []}, "now"
+    )
+    assert [p["type"] for p in planned] == ["checkpoint", "delta"]
+    assert planned[0]["at"] == "2024-01-01T00:00:00"
+    assert planned[0]["body"] == {"data": series(2)}
+
+
+def test_new_series_starts_with_checkpoint():
+    planned = history.plan_revisions([], [], "h0", None, series(1), "h1", {}, "now")
+    assert [p["type"] for p in planned] == ["checkpoint"]
+
+
+def test_checkpoint_every_n_deltas():
+    revisions, types = [], []
+    for n in range(1, 2 * EVERY + 4):
+        planned = history.plan_revisions(
+            revisions, series(n - 1), f"h{n - 1}", None, series(n), f"h{n}", {}, "now"
+        )
+        for p in planned:
+            revisions.append({"rev": len(revisions) + 1, "type": p["type"], "hash": p["hash"]})
+            types.append(p["type"])
+
+    checkpoints = [i + 1 for i, t in enumerate(types) if t == "checkpoint"]
+    assert checkpoints == [1, EVERY + 2, 2 * EVERY + 3]
+
+
+def test_missed_change_forces_checkpoint():
+    revisions = [
+        {"rev": 1, "type": "checkpoint", "hash": "h1"},
+        {"rev": 2, "type": "delta", "hash": "h2"},
+    ]
+    planned = history.plan_revisions(revisions, series(5), "h5", None, series(6), "h6", {}, "now")
+    assert [p["type"] for p in planned] == ["checkpoint"]
+
+
+# -----------------------------
+# revisions_until
+# -----------------------------
+MANIFEST = {
+    "revisions": [
+        {"rev": 1, "at": "2024-01-10T09:00:00", "type": "checkpoint"},
+        {"rev": 2, "at": "2024-02-10T09:00:00", "type": "delta"},
+        {"rev": 3, "at": "2024-03-10T09:00:00", "type": "checkpoint"},
+        {"rev": 4, "at": "2024-04-10T09:00:00", "type": "delta"},
+        {"rev": 5, "at": "2024-04-10T18:00:00", "type": "delta"},
+    ]
+}
+
+
+@pytest.mark.parametrize(
+    "as_of, revs",
+    [
+        ("2024-01-09", []),
+        ("2024-01-10T08:59:59", []),
+        ("2024-01-10", [1]),
+        ("2024-02-28", [1, 2]),
+        ("2024-03-10T09:00:00", [3]),
+        ("2024-04-10T12:00:00", [3, 4]),
+        ("2024-04-10", [3, 4, 5]),  # 날짜만 주면 그날 끝까지
+        ("2030-01-01", [3, 4, 5]),
+    ],
+)
+def test_revisions_until_starts_at_last_checkpoint(as_of, revs):
+    assert [r["rev"] for r in history.revisions_until(MANIFEST, as_of)] == revs
+
+
+# -----------------------------
+# record_revision / series_as_of
+# -----------------------------
+def test_series_as_of_replays_every_state(s3):
+    states = [series(n) for n in range(1, EVERY + 6)]
+    states[3] = [{**p, "y": 0.0} if p["x"] == "2020-02" else p for p in states[3]]
+
+    previous = []
+    for state in states:
+        publish(previous, state)
+        previous = state
+
+    revisions = manifest(s3)["revisions"]
+    assert len(revisions) == len(states)
+    for r, state in zip(revisions, states):
+        assert history.series_as_of(BUCKET, KEY, r["at"]) == state
+
+
+def test_orphan_revision_is_skipped_not_overwritten(s3):
+    publish([], series(1))
+
+    # 이전 실행이 리비전 객체만 쓰고 manifest 커밋 전에 죽은 상태
+    orphan = history.revision_key(KEY, 2)
+    s3.objects[orphan] = (b'{"rev":2,"orphan":true}', '"orphan"')
+
+    rev = publish(series(1), series(2))
+    assert rev == 3
+    assert s3.objects[orphan][1] == '"orphan"'
+    assert [r["rev"] for r in manifest(s3)["revisions"]] == [1, 3]
+
+    # 이후 변경도 계속 기록되고 복원된다
+    assert publish(series(2), series(3)) == 4
+    assert history.series_as_of(BUCKET, KEY, "2100-01-01") == series(3)
@@ -0,0 +1,70 @@
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "bok"))
+
+import normalize  # noqa: E402
+
+from . import legacy_normalize as legacy  # noqa: E402
+
+FUNCTIONS = [
+    "unify_roman_and_symbols",
+    "normalize_text",
+    "remove_table_of_contents",
+    "cut_statistics_section",
+    "clean_non_text_blocks",
+]
+
+SAMPLES = [
+    "",
+    "   \n\n  ",
+    "Ⅰ-1. 경제 동향 (조사국 거시분석팀)\n국내 경기는 완만한 회복세를 보였다.",
+    "[그림 Ⅰ-3] 소비자물가\n[ 표 2 ] 주요 지표\n주: 1) 전년동기대비\n주 3 기준\n자료: 통계청\n출처 한국은행\n- 12 -",
+    "수출은 반도체를 중심으로 증가1)하였다. 2) 다만 ž 불확실성은 높다.",
+    "GDP 성장률은 2.1%로 전망된다. 2.1 2.3 -0.4 1,234 2024/05 비율 상승. 표 3 요약. 자료: BOK",
+    "１２３ ٣٤ 1.2 3.4 ５.６ 가. 나! 다? 라.\t마",
+    "𝑰𝐈𝘐𝕀𝖨𝗜𝛪Ｉ – — − ﹣ ‐ 。．｡ ★ ※ ◦ ① ㈜ “따옴표” 'single'",
+    "목차 Ⅰ. 개요 ........ 3\nⅠ - 1 본문 시작\n주요 통계 및 참고자료\n1.2 3.4",
+    "a b c　d\x0ce\x1cf g",
+    "3) 4) 5)\n-3-\n\n-  7  -\n주:2\n자료:",
+]
+
+FRAGMENTS = [
+    "국내 경기는", "회복세를 보였다.", "물가 상승률은", "2.5%", "(전년동기대비)",
+    "1)", "23)", "[그림 Ⅰ-2]", "표 4", "주: 1)", "자료:", "출처 ", "- 15 -",
+    "ž", "Ⅱ", "Ⅰ-1", "I - 1", "–", "—", "。", "．", "𝑰", "★", "※", "·",
+    "1,234", "-0.3", "2024/05", "3.1", "12", "!", "?", ".", "\n", "\n\n", " ",
+    "\t", " ", "\x0c", "주요 통계 및 참고", "(금융시장국 자금시장팀)", "１２", "٣",
+]
+
+
+def random_text(rng: random.Random, length: int) -> str:
+    return " ".join(rng.choice(FRAGMENTS) for _ in range(length))
+
+
+def corpus() -> list[str]:
+    rng = random.Random(20240522)
+    return SAMPLES + [random_text(rng, rng.randint(1, 400)) for _ in range(300)]
+
+
+@pytest.mark.parametrize("name", FUNCTIONS)
+def test_matches_legacy_byte_for_byte(name):
+    new, old = getattr(normalize, name), getattr(legacy, name)
+
+    for text in corpus():
+        assert new(text).encode("utf-8") == old(text).encode("utf-8"), repr(text)
+
+
+def test_pipeline_matches_legacy():
+    def pipeline(module, text):
+        text = module.unify_roman_and_symbols(text)
+        text = module.normalize_text(text)
+        text = module.remove_table_of_contents(text)
+        text = module.cut_statistics_section(text)
+        return module.clean_non_text_blocks(text)
+
+    for text in corpus():
+        assert pipeline(normalize, text) == pipeline(legacy, text), repr(text)
@@ -0,0 +1,100 @@
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "bok"))
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+import scheduler  # noqa: E402
+import watch  # noqa: E402
+
+NOW = datetime(2026, 10, 19, 7, 0, tzinfo=timezone.utc)
+
+
+class FakeScheduler:
+    """create / delete / list_schedules 만 흉내 내는 EventBridge Scheduler 대역"""
+
+    class ConflictException(Exception):
+        pass
+
+    class ResourceNotFoundException(Exception):
+        pass
+
+    def __init__(self):
+        self.schedules = {}
+        self.exceptions = self
+
+    def create_schedule(self, Name, **params):
+        if Name in self.schedules:
+            raise self.ConflictException(Name)
+        self.schedules[Name] = params
+
+    def delete_schedule(self, Name):
+        if self.schedules.pop(Name, None) is None:
+            raise self.ResourceNotFoundException(Name)
+
+    def get_paginator(self, operation):
+        assert operation == "list_schedules"
+        fake = self
+
+        class Paginator:
+            def paginate(self, NamePrefix):
+                names = sorted(n for n in fake.schedules if n.startswith(NamePrefix))
+                # 한 페이지에 1개씩 (페이지 넘김 확인)
+                return [{"Schedules": [{"Name": n}]} for n in names] or [{"Schedules": []}]
+
+        return Paginator()
+
+    def run_due(self, now):
+        """실행 시각이 지난 스케줄을 실행하고 삭제 (ActionAfterCompletion: DELETE)"""
+        for name in list(self.schedules):
+            if watch.parse_schedule_name(scheduler.SCHEDULE_NAME, name) <= now:
+                del self.schedules[name]
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    fake = FakeScheduler()
+    monkeypatch.setattr(scheduler, "scheduler", fake)
+    monkeypatch.setattr(scheduler, "WATCH_ROLE_ARN", "arn:aws:iam::1:role/scheduler")
+    monkeypatch.setattr(scheduler, "WATCH_TARGET_ARN", "arn:aws:lambda:fn:batch")
+    return fake
+
+
+def test_each_check_gets_its_own_schedule(fake):
+    first = scheduler.schedule_check(60, now=NOW)
+    assert first["status"] == "SCHEDULED"
+
+    # 예약된 실행 안에서 다음 확인을 잡는다 → 실행 중인 스케줄과 다른 이름
+    running_at = NOW + timedelta(seconds=60)
+    second = scheduler.schedule_check(120, now=running_at)
+    assert second["status"] == "SCHEDULED"
+    assert second["name"] != first["name"]
+
+    # 실행이 끝난 스케줄이 자동 삭제돼도 다음 확인은 남는다
+    fake.run_due(running_at)
+    assert list(fake.schedules) == [second["name"]]
+    assert fake.schedules[second["name"]]["ActionAfterCompletion"] == "DELETE"
+
+
+def test_earlier_pending_check_is_kept_and_later_ones_replaced(fake):
+    early = scheduler.schedule_check(60, now=NOW)
+
+    kept = scheduler.schedule_check(600, now=NOW)
+    assert kept == {"status": "KEPT", "at": (NOW + timedelta(seconds=60)).isoformat()}
+
+    fake.run_due(NOW + timedelta(seconds=60))
+    later = scheduler.schedule_check(3600, now=NOW + timedelta(seconds=60))
+    sooner = scheduler.schedule_check(120, now=NOW + timedelta(seconds=60))
+
+    assert early["name"] not in fake.schedules
+    assert later["name"] not in fake.schedules
+    assert list(fake.schedules) == [sooner["name"]]
+
+
+def test_disabled_without_role_or_target(fake, monkeypatch):
+    monkeypatch.setattr(scheduler, "WATCH_ROLE_ARN", None)
+    assert scheduler.schedule_check(60, now=NOW) == {"status": "DISABLED"}
+    assert fake.schedules == {}
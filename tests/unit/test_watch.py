@@ -0,0 +1,150 @@
+import os
+import sys
+from datetime import datetime, timezone
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "bok"))
+
+import watch  # noqa: E402
+
+from .fake_batch_api import FakeBatchAPI  # noqa: E402
+
+MIN = watch.MIN_DELAY_SECONDS
+MAX = watch.MAX_DELAY_SECONDS
+
+
+def drain(api: FakeBatchAPI, batch_ids: list[str]) -> tuple[dict, int]:
+    """
+    app_batch 감시 실행을 흉내 낸다: 진행 중인 배치를 확인하고
+    plan_next_check 가 정한 만큼 시계를 움직인다.
+    반환: (batch_id → 끝난 것을 확인한 시각, 확인 횟수)
+    """
+    detected, pending, checks = {}, list(batch_ids), 0
+
+    while True:
+        checks += 1
+        running = []
+        for batch_id in pending:
+            batch = api.retrieve(batch_id)
+            if batch.status in watch.RUNNING_STATUSES:
+                running.append({"status": batch.status, "created_at": batch.created_at})
+            else:
+                detected[batch_id] = (api.now, batch.status)
+
+        pending = [b for b in pending if b not in detected]
+        delay = watch.plan_next_check(running, api.now)
+        if delay is None:
+            return detected, checks
+
+        assert MIN <= delay <= MAX
+        api.advance(delay)
+
+
+@pytest.mark.parametrize(
+    "age, expected",
+    [
+        (0, MIN),
+        (MIN, MIN),                  # 다음 시점 2·MIN
+        (100, MIN),                  # 20초 뒤가 아니라 최소 간격
+        (130, 4 * MIN - 130),
+        (5000, 128 * MIN - 5000),
+        (10_000, MAX),               # 간격 상한
+    ],
+)
+def test_next_check_delay_doubles_from_created_at(age, expected):
+    created_at = 1_000_000.0
+    assert watch.next_check_delay("in_progress", created_at, created_at + age) == expected
+
+
+def test_finalizing_is_checked_soon_and_finished_batches_stop():
+    assert watch.next_check_delay("finalizing", 0, 20_000) == MIN
+    for status in ("completed", "failed", "expired", "cancelled"):
+        assert watch.next_check_delay(status, 0, 100) is None
+
+
+def test_plan_next_check_takes_earliest_running_batch():
+    now = 1_000_000.0
+    batches = [
+        {"status": "in_progress", "created_at": now - 10_000},
+        {"status": "validating", "created_at": now - 130},
+        {"status": "completed", "created_at": now},
+        {"status": "in_progress", "created_at": None},
+    ]
+    assert watch.plan_next_check(batches, now) == 4 * MIN - 130
+    assert watch.plan_next_check(batches[2:], now) is None
+    assert watch.plan_next_check([], now) is None
+
+
+@pytest.mark.parametrize("run_seconds", [60, 10 * 60, 47 * 60, 3 * 3600, 20 * 3600])
+def test_completion_is_detected_promptly(run_seconds):
+    api = FakeBatchAPI()
+    batch_id = api.create(run_seconds)
+
+    detected, checks = drain(api, [batch_id])
+    seen_at, status = detected[batch_id]
+    finished_at = api.finished_at(batch_id)
+    created_at = api.batches[batch_id]["created_at"]
+
+    assert status == "completed"
+    # 확인 지연은 경과 시간과 MAX 중 작은 값 이내 (고정 cron 이면 최대 일주일)
+    assert 0 <= seen_at - finished_at <= min(max(finished_at - created_at, MIN), MAX)
+    # 간격이 배로 늘어나므로 확인 횟수는 로그 + 시간당 1회 수준
+    assert checks <= 12 + run_seconds // MAX
+
+
+def test_batches_from_different_submissions_all_drain():
+    api = FakeBatchAPI()
+    first = api.create(4 * 3600)
+    api.advance(2 * 3600)
+    second = api.create(5 * 60)
+    third = api.create(30 * 60, outcome="failed")
+
+    detected, _ = drain(api, [first, second, third])
+
+    assert {b: s for b, (_, s) in detected.items()} == {
+        first: "completed",
+        second: "completed",
+        third: "failed",
+    }
+    # 뒤에 제출한 짧은 배치가 앞 배치의 긴 간격에 묶이지 않는다
+    assert detected[second][0] - api.finished_at(second) <= 10 * 60
+
+
+def test_batch_that_never_finishes_expires_and_watch_stops():
+    api = FakeBatchAPI()
+    batch_id = api.create(30 * 3600)
+
+    detected, checks = drain(api, [batch_id])
+
+    assert detected[batch_id][1] == "expired"
+    assert checks <= 12 + 24
+
+
+def test_at_expression_and_schedule_name():
+    when = datetime(2026, 10, 19, 7, 5, 30, tzinfo=timezone.utc)
+
+    assert watch.at_expression(when) == "at(2026-10-19T07:05:30)"
+    name = watch.schedule_name("bok-batch-watch", when)
+    assert name == "bok-batch-watch-20261019T070530"
+    assert watch.parse_schedule_name("bok-batch-watch", name) == when
+    assert watch.parse_schedule_name("bok-batch-watch", "bok-batch-watch") is None
+    assert watch.parse_schedule_name("bok-batch-watch", "bok-batch-watch-manual") is None
+    assert watch.parse_schedule_name("other", name) is None
+
+
+def test_keep_existing_only_when_earlier_and_not_yet_due():
+    now = datetime(2026, 10, 19, 7, 0, tzinfo=timezone.utc)
+    wanted = watch.check_time(now, 600)
+
+    assert watch.keep_existing(watch.check_time(now, 60), wanted, now)
+    assert not watch.keep_existing(watch.check_time(now, 3600), wanted, now)
+    assert not watch.keep_existing(now, wanted, now)  # 지금 실행 중인 예약
+    assert not watch.keep_existing(None, wanted, now)
+
+
+def test_overdue_after_completion_window_and_slack():
+    created_at = 1_000_000.0
+    assert not watch.overdue(created_at, created_at + 24 * 3600)
+    assert watch.overdue(created_at, created_at + watch.MAX_RUNNING_SECONDS + 1)
+    assert not watch.overdue(None, created_at)
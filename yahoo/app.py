@@ -1,65 +1,48 @@
 from common.slack import send_slack_message
-import hashlib
+from common.resample import from_epoch, resample
+from common.store import publish_series
 import json
-import boto3
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
 import os
 import requests
-from botocore.exceptions import ClientError
-
-s3 = boto3.client("s3")
 
 # -----------------------------
 # 환경 변수
 # -----------------------------
 BUCKET_NAME = os.environ["S3_BUCKET_NAME"]
-OUTPUT_KEY = os.environ["S3_OUTPUT_KEY"]
+OUTPUT_KEY = os.environ.get("S3_OUTPUT_KEY")
 
 SYMBOL = os.environ.get("YAHOO_SYMBOL", "CL=F")
 
+# 심볼 → 출력 키 (없으면 YAHOO_SYMBOL / S3_OUTPUT_KEY 단일 설정)
+# {"CL=F": "data/oil.json", "GC=F": "data/gold.json"}
+SERIES = json.loads(os.environ.get("YAHOO_SERIES") or "null") or {SYMBOL: OUTPUT_KEY}
 
-# -----------------------------
-# 기존 데이터 로드
-# -----------------------------
-def load_existing_data() -> list:
-    try:
-        r = s3.get_object(Bucket=BUCKET_NAME, Key=OUTPUT_KEY)
-        return json.loads(r["Body"].read())
-    except ClientError as e:
-        if e.response["Error"]["Code"] == "NoSuchKey":
-            return []
-        raise
-
+FETCH_WORKERS = 4
 
-# -----------------------------
-# 업로드
-# -----------------------------
-def upload_json(data: list):
-    s3.put_object(
-        Bucket=BUCKET_NAME,
-        Key=OUTPUT_KEY,
-        Body=json.dumps(data, ensure_ascii=False).encode("utf-8"),
-        ContentType="application/json",
-        CacheControl="max-age=3600",
-    )
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120 Safari/537.36"
+}
 
+# 심볼 여러 개를 같은 커넥션 풀로 조회
+session = requests.Session()
+session.headers.update(HEADERS)
 
-def fetch_recent_daily(symbol: str):
-    now = datetime.now(timezone.utc)
-    start = now - timedelta(days=60)
 
+def fetch_daily(symbol: str, start: datetime, end: datetime):
+    """
+    period1 ~ period2 일봉을 한 번의 chart 요청으로 받는다.
+    (백필도 구간만 넓혀 같은 요청 1회)
+    """
     params = {
         "interval": "1d",
         "period1": int(start.timestamp()),
-        "period2": int(now.timestamp()),
-    }
-    
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120 Safari/537.36"
+        "period2": int(end.timestamp()),
     }
-    
+
     url = f"https://query2.finance.yahoo.com/v8/finance/chart/{symbol}"
-    resp = requests.get(url, params=params, timeout=10, headers=headers)
+    resp = session.get(url, params=params, timeout=10)
     resp.raise_for_status()
 
     data = resp.json()
@@ -80,82 +63,147 @@ def fetch_recent_daily(symbol: str):
     return result
 
 
-def get_previous_month_last_close(result):
-    timestamps = result["timestamp"]
-    closes = result["indicators"]["quote"][0]["close"]
-
+def fetch_recent_daily(symbol: str):
+    """
+    지난달 월말 종가만 필요하므로 지난달 1일부터만 받는다.
+    """
     now = datetime.now(timezone.utc)
-    this_month = now.replace(day=1)
-    prev_month_end = this_month - timedelta(days=1)
-    prev_month_str = prev_month_end.strftime("%Y-%m")
+    prev_month_start = (now.replace(day=1) - timedelta(days=1)).replace(day=1)
+    start = prev_month_start.replace(hour=0, minute=0, second=0, microsecond=0)
+    return fetch_daily(symbol, start, now)
 
-    last_close = None
-    last_ts = None
 
-    for ts, close in zip(timestamps, closes):
-        if close is None:
-            continue
+def get_monthly_last_closes(result, until: str) -> list:
+    """
+    일봉 → 월별 마지막 종가. until(YYYY-MM) 이전의 끝난 달만.
+    """
+    timestamps = result.get("timestamp") or []
+    if not timestamps:
+        return []
 
-        dt = datetime.fromtimestamp(ts, tz=timezone.utc)
-        ym = dt.strftime("%Y-%m")
+    closes = result["indicators"]["quote"][0]["close"]
+    return resample(
+        from_epoch(timestamps), closes, "last", freq="M", until=until, decimals=2
+    )["last"]
 
-        if ym == prev_month_str:
-            if last_ts is None or ts > last_ts:
-                last_ts = ts
-                last_close = float(close)
 
-    if last_close is None:
-        raise RuntimeError("No data for previous month")
+def get_previous_month_last_close(result):
+    now = datetime.now(timezone.utc)
+    prev_month_str = (now.replace(day=1) - timedelta(days=1)).strftime("%Y-%m")
 
-    return {
-        "x": prev_month_str,
-        "y": round(last_close, 2)
-    }
-    
-def append_if_missing(existing, new_item):
-    months = {item["x"] for item in existing}
+    months = get_monthly_last_closes(result, now.strftime("%Y-%m"))
+    point = next((p for p in months if p["x"] == prev_month_str), None)
 
-    if new_item["x"] in months:
-        return existing, False
+    if point is None:
+        raise RuntimeError("No data for previous month")
 
-    existing.append(new_item)
-    existing.sort(key=lambda x: x["x"])
-    return existing, True
+    return point
 
 # -----------------------------
 # 메인 로직
 # -----------------------------
+def fetch_all(fetch) -> dict:
+    """
+    심볼별 조회를 병렬로 실행. 실패한 심볼은 예외 객체로 돌려준다.
+    """
+    def safe(symbol):
+        try:
+            return fetch(symbol)
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=min(FETCH_WORKERS, len(SERIES))) as pool:
+        return dict(zip(SERIES, pool.map(safe, SERIES)))
+
+
+def summarize(results: list[dict]) -> dict:
+    total = len(results)
+    failed = sum(1 for r in results if r["status"] == "ERROR")
+
+    if failed == 0:
+        status = "SUCCESS"
+    elif failed < total:
+        status = "PARTIAL_FAILURE"
+    else:
+        status = "FAILURE"
+
+    return {
+        "status": status,
+        "total": total,
+        "failed": failed,
+        "results": results,
+    }
+
+
 def run():
-    result = fetch_recent_daily(SYMBOL)
-    new_month = get_previous_month_last_close(result)
+    fetched = fetch_all(fetch_recent_daily)
+    results = []
 
-    existing = load_existing_data()
+    for symbol, key in SERIES.items():
+        try:
+            daily = fetched[symbol]
+            if isinstance(daily, Exception):
+                raise daily
 
-    updated, appended = append_if_missing(existing, new_month)
+            new_month = get_previous_month_last_close(daily)
 
-    if not appended:
-        return {
-            "status": "NO_CHANGE",
-            "month": new_month["x"]
-        }
+            # 이미 있는 월은 유지 (append-only)
+            result = publish_series(BUCKET_NAME, key, [new_month], overwrite=False)
+            result["month"] = new_month["x"]
+        except Exception as e:
+            result = {"status": "ERROR", "error": str(e)}
 
-    upload_json(updated)
+        results.append({"key": key, "symbol": symbol, **result})
 
-    return {
-        "status": "SUCCESS",
-        "appended_month": new_month["x"]
-    }
+    return summarize(results)
+
+
+def run_backfill(start_ym: str, end_ym: str):
+    """
+    start_ym ~ end_ym (YYYY-MM) 구간을 심볼당 chart 요청 1회로 받아
+    비어 있는 월만 채운 뒤 시계열마다 한 번에 업로드한다.
+    """
+    now = datetime.now(timezone.utc)
+    this_month = now.strftime("%Y-%m")
+
+    start = datetime.strptime(start_ym, "%Y-%m").replace(tzinfo=timezone.utc)
+    end_month = datetime.strptime(end_ym, "%Y-%m").replace(tzinfo=timezone.utc)
+    end = min((end_month.replace(day=28) + timedelta(days=4)).replace(day=1), now)
+
+    fetched = fetch_all(lambda symbol: fetch_daily(symbol, start, end))
+    results = []
+
+    for symbol, key in SERIES.items():
+        try:
+            daily = fetched[symbol]
+            if isinstance(daily, Exception):
+                raise daily
+
+            months = [p for p in get_monthly_last_closes(daily, this_month) if p["x"] <= end_ym]
+            result = publish_series(BUCKET_NAME, key, months, overwrite=False)
+            result["months"] = len(months)
+        except Exception as e:
+            result = {"status": "ERROR", "error": str(e)}
+
+        results.append({"key": key, "symbol": symbol, **result})
+
+    return {**summarize(results), "range": f"{start_ym}~{end_ym}"}
 
 
 # -----------------------------
 # Lambda Entrypoint
 # -----------------------------
 def lambda_handler(event, context):
+    backfill = (event or {}).get("backfill")
+
     try:
-        result = run()
+        if backfill:
+            result = run_backfill(backfill["start"], backfill["end"])
+        else:
+            result = run()
 
         send_slack_message(
-            service=f"Yahoo Snapshot | {OUTPUT_KEY}",
+            service=f"Yahoo Snapshot | {OUTPUT_KEY or 'multi-symbol'}",
             result=result
         )
 
@@ -166,7 +214,7 @@ def lambda_handler(event, context):
 
     except Exception as e:
         send_slack_message(
-            service=f"Yahoo Snapshot | {OUTPUT_KEY}",
+            service=f"Yahoo Snapshot | {OUTPUT_KEY or 'multi-symbol'}",
             message=str(e),
             status="ERROR",
         )